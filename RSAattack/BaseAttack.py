@@ -1,8 +1,168 @@
+import functools
+import logging
 import math
 import random
 import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Callable, List, Any, Dict
+from typing import Callable, List, Any, Dict, Tuple
+
+try:
+    from gmpy2 import is_strong_prp
+except ImportError:  # gmpy2 é opcional: cai no Miller-Rabin em Python puro
+    is_strong_prp = None
+
+logger = logging.getLogger(__name__)
+
+
+# Conjuntos de bases para Miller-Rabin determinístico
+WITNESSES_32 = (2, 7, 61)
+WITNESSES_64 = (2, 325, 9375, 28178, 450775, 9780504, 1795265022)
+WITNESSES_LARGE = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+
+# ------------------------------
+#  Geração de chaves pequenas
+# ------------------------------
+
+_SMALL_PRIMES_TUPLE = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29)
+_SMALL_PRIMES_SET = frozenset(_SMALL_PRIMES_TUPLE)
+_SMALL_PRODUCT = math.prod(_SMALL_PRIMES_TUPLE)
+
+
+def _is_probable_prime(n: int) -> bool:
+    if n < 2:
+        return False
+    # Um gcd com 2·3·...·29 substitui os dez testes de divisibilidade
+    if math.gcd(n, _SMALL_PRODUCT) != 1:
+        return n in _SMALL_PRIMES_SET
+
+    # Bases fixas: determinístico para n < 2^64 (e para n < 3.3e24 com
+    # os 13 primeiros primos); dispensa random.randrange no hot path.
+    bits = n.bit_length()
+    if bits <= 32:
+        witnesses = WITNESSES_32
+    elif bits <= 64:
+        witnesses = WITNESSES_64
+    else:
+        witnesses = WITNESSES_LARGE
+
+    # Com gmpy2, cada rodada de Miller-Rabin roda inteira em C (GMP).
+    # is_strong_prp levanta ValueError se gcd(n, a) > 1: base com fator
+    # comum (ex.: 28178 = 2·73·193) já prova que n é composto
+    if is_strong_prp is not None:
+        for a in witnesses:
+            a %= n
+            if a == 0:
+                continue
+            if math.gcd(a, n) != 1 or not is_strong_prp(n, a):
+                return False
+        return True
+
+    # Aliases locais (LOAD_FAST) e n - 1 calculado uma única vez
+    _pow = pow
+    n_minus_1 = n - 1
+
+    # n - 1 = 2^r * d: r é o número de zeros à direita (ctz)
+    r = (n_minus_1 & -n_minus_1).bit_length() - 1
+    d = n_minus_1 >> r
+
+    for a in witnesses:
+        a %= n
+        if a == 0:
+            continue
+        x = _pow(a, d, n)
+        if x == 1 or x == n_minus_1:
+            continue
+        for _ in range(r - 1):
+            x = _pow(x, 2, n)
+            if x == n_minus_1:
+                break
+        else:
+            return False
+    return True
+
+
+# Produto dos primos ímpares até 229 (os 50 primeiros primos, sem o 2)
+_PRIMORIAL = math.prod(p for p in range(3, 230, 2) if _is_probable_prime(p))
+
+
+def _generate_prime(bits: int, rng: random.Random) -> int:
+    while True:
+        candidate = rng.getrandbits(bits)
+        candidate |= (1 << (bits - 1))
+        candidate |= 1
+        # Um gcd descarta quem tem fator primo pequeno antes do Miller-Rabin
+        # (g == candidate só acontece para candidatos menores que 230)
+        g = math.gcd(candidate, _PRIMORIAL)
+        if g != 1 and g != candidate:
+            continue
+        if _is_probable_prime(candidate):
+            return candidate
+
+
+def _next_prime(n: int) -> int:
+    """Menor primo >= n (n > 2)."""
+    n |= 1
+    while not _is_probable_prime(n):
+        n += 2
+    return n
+
+
+def _build_keys_uncached(key_sizes_bits: tuple, base_e: int, seed: int | None) -> tuple:
+    """Gera as chaves usando um gerador local (não toca no estado global de `random`)."""
+    rng = random.Random(seed)
+    keys = []
+    for bits in key_sizes_bits:
+        half = bits // 2
+        p = _generate_prime(half, rng)
+        q = _generate_prime(bits - half, rng)
+        n = p * q
+        phi = (p - 1) * (q - 1)
+
+        e = base_e
+        if _is_probable_prime(e):
+            # e primo: gcd(e, φ) == 1  <=>  e não divide p-1 nem q-1
+            while (p - 1) % e == 0 or (q - 1) % e == 0:
+                e = _next_prime(e + 1)
+        else:
+            while math.gcd(e, phi) != 1:
+                e += 2
+
+        d = pow(e, -1, phi)
+
+        keys.append(
+            {"bits": bits, "p": p, "q": q, "n": n, "phi": phi, "e": e, "d": d}
+        )
+    return tuple(keys)
+
+
+# Mesmos (tamanhos, e, seed) -> mesmas chaves: reaproveita entre instâncias
+_build_keys = functools.lru_cache(maxsize=32)(_build_keys_uncached)
+
+
+# ------------------------------
+#  Execução de um ataque
+# ------------------------------
+
+def _run_one(attack_func: Callable[..., Any], n: int, e: int, attack_kwargs: dict) -> Tuple[float, Any, str | None]:
+    """
+    Executa um único ataque e devolve (elapsed, saída, erro).
+
+    Fica no nível do módulo para poder ser enviado a um ProcessPoolExecutor.
+    KeyboardInterrupt não é capturado aqui: quem chama decide o que fazer.
+    """
+    # Resetar o timeout_flag se foi fornecido
+    if "timeout_flag" in attack_kwargs:
+        attack_kwargs["timeout_flag"].start_time = time.perf_counter()
+        attack_kwargs["timeout_flag"].timeout_flag = False
+
+    start = time.perf_counter()
+    try:
+        out = attack_func(n, e, **attack_kwargs)
+    except Exception as ex:
+        return time.perf_counter() - start, None, str(ex)
+    return time.perf_counter() - start, out, None
 
 
 @dataclass
@@ -21,7 +181,8 @@ class RSABenchmark:
     Classe para:
     - gerar chaves RSA pequenas
     - aplicar UMA função de ataque
-    - mostrar logs detalhados
+    - mostrar logs detalhados (verbose=False silencia geração e ataques;
+      o valor de n de cada ataque vai para logger.debug)
     - gerar relatório final
     """
 
@@ -30,10 +191,15 @@ class RSABenchmark:
         key_sizes_bits=(16, 20, 24, 28, 32),
         e: int = 65537,
         seed: int | None = None,
+        verbose: bool = True,
     ):
         self.key_sizes_bits = key_sizes_bits
         self.base_e = e
+        self.seed = seed
+        self.verbose = verbose
 
+        # Mantém o estado global reprodutível para ataques que usam `random`
+        # (as chaves usam um random.Random próprio, ver _build_keys)
         if seed is not None:
             random.seed(seed)
 
@@ -44,140 +210,161 @@ class RSABenchmark:
     #  Geração de chaves pequenas
     # ------------------------------
 
-    def _is_probable_prime(self, n: int, k: int = 8) -> bool:
-        if n < 2:
-            return False
-        small_primes = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
-        if n in small_primes:
-            return True
-        for p in small_primes:
-            if n % p == 0:
-                return False
-
-        d = n - 1
-        r = 0
-        while d % 2 == 0:
-            d //= 2
-            r += 1
-
-        for _ in range(k):
-            a = random.randrange(2, n - 2)
-            x = pow(a, d, n)
-            if x == 1 or x == n - 1:
-                continue
-            for _ in range(r - 1):
-                x = pow(x, 2, n)
-                if x == n - 1:
-                    break
-            else:
-                return False
-        return True
-
-    def _generate_prime(self, bits: int) -> int:
-        while True:
-            candidate = random.getrandbits(bits)
-            candidate |= (1 << (bits - 1))
-            candidate |= 1
-            if self._is_probable_prime(candidate):
-                return candidate
-
     def _generate_keys(self):
-        print("\n🔐 Gerando chaves RSA...\n")
-        for bits in self.key_sizes_bits:
-            half = bits // 2
-            p = self._generate_prime(half)
-            q = self._generate_prime(bits - half)
-            n = p * q
-            phi = (p - 1) * (q - 1)
-
-            e = self.base_e
-            while math.gcd(e, phi) != 1:
-                e += 2
-
-            d = pow(e, -1, phi)
-
-            print(f" - Chave {bits:2} bits gerada: n = {n}")
-
-            self.keys.append(
-                {"bits": bits, "p": p, "q": q, "n": n, "phi": phi, "e": e, "d": d}
-            )
-
-        print("\n✅ Todas as chaves foram geradas!\n")
+        if self.verbose:
+            print("\n🔐 Gerando chaves RSA...\n")
+        if self.seed is None:
+            keys = _build_keys_uncached(tuple(self.key_sizes_bits), self.base_e, None)
+        else:
+            keys = _build_keys(tuple(self.key_sizes_bits), self.base_e, self.seed)
+
+        for key in keys:
+            if self.verbose:
+                print(f" - Chave {key['bits']:2} bits gerada: n = {key['n']}")
+            # cópia: o cache guarda os dicts originais
+            self.keys.append(dict(key))
+
+        if self.verbose:
+            print("\n✅ Todas as chaves foram geradas!\n")
 
     # ------------------------------
     #  Rodar ataque com logs detalhados
     # ------------------------------
 
-    def run(self, attack_func: Callable[..., Any], **attack_kwargs) -> List[AttackResult]:
+    def run(
+        self,
+        attack_func: Callable[..., Any],
+        parallel: bool = False,
+        max_workers: int | None = None,
+        **attack_kwargs,
+    ) -> List[AttackResult]:
+        """
+        Roda `attack_func(n, e, **attack_kwargs)` contra cada chave.
+
+        Com parallel=True, cada chave vira uma tarefa num ProcessPoolExecutor
+        (as chaves são independentes). Nesse modo attack_func e os kwargs
+        precisam ser picklable (funções de módulo) e os logs de cada chave
+        aparecem, em ordem, quando o respectivo ataque termina.
+        """
         results: List[AttackResult] = []
+        verbose = self.verbose
 
-        print("\n🚀 Iniciando ataques...\n")
+        if verbose:
+            print("\n🚀 Iniciando ataques...\n")
 
-        for key in self.keys:
-            n, e, bits = key["n"], key["e"], key["bits"]
+        if parallel:
+            self._run_parallel(results, attack_func, max_workers, attack_kwargs)
+        else:
+            for key in self.keys:
+                n, e, bits = key["n"], key["e"], key["bits"]
+                self._print_header(bits, n)
 
-            print(f"\n==========================================")
-            print(f"🔎 Rodando teste com chave de {bits} bits")
-            print(f"   n = {n}")
-            print(f"==========================================\n")
+                start = time.perf_counter()
+                try:
+                    elapsed, out, error = _run_one(attack_func, n, e, attack_kwargs)
+                except KeyboardInterrupt:
+                    self._record_interrupted(results, bits, n, time.perf_counter() - start)
+                    break  # sai do loop de chaves e retorna resultados parciais
 
-            start = time.perf_counter()
-            extra: dict = {}
-            p = q = None
+                results.append(self._make_result(bits, n, elapsed, out, error))
 
-            # Resetar o timeout_flag se foi fornecido
-            if "timeout_flag" in attack_kwargs:
-                attack_kwargs["timeout_flag"].start_time = time.perf_counter()
-                attack_kwargs["timeout_flag"].timeout_flag = False
+        if verbose:
+            print("\n🏁 Fim dos ataques (normal ou interrompido)!\n")
+        return results
 
+    def _run_parallel(
+        self,
+        results: List[AttackResult],
+        attack_func: Callable[..., Any],
+        max_workers: int | None,
+        attack_kwargs: dict,
+    ) -> None:
+        if not self.keys:
+            return
+
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+        completed = False
+        try:
+            futures = [
+                (key, executor.submit(_run_one, attack_func, key["n"], key["e"], attack_kwargs))
+                for key in self.keys
+            ]
+            n, bits = self.keys[0]["n"], self.keys[0]["bits"]
+            start = time.perf_counter()
             try:
-                out = attack_func(n, e, **attack_kwargs)
+                for key, future in futures:
+                    n, bits = key["n"], key["bits"]
+                    elapsed, out, error = future.result()
+                    self._print_header(bits, n)
+                    results.append(self._make_result(bits, n, elapsed, out, error))
             except KeyboardInterrupt:
-                elapsed = time.perf_counter() - start
-                print("⏹ Execução interrompida pelo usuário (Ctrl+C) durante este ataque.\n")
-
-                # registra essa chave como interrompida
-                results.append(
-                    AttackResult(
-                        bits,
-                        n,
-                        False,
-                        None,
-                        None,
-                        elapsed,
-                        {"interrupted": True},
-                    )
-                )
-
-                print("⚠ Interrupção detectada. Gerando relatório parcial com os resultados até agora...\n")
-                break  # sai do loop de chaves e retorna resultados parciais
-
-            except Exception as ex:
-                elapsed = time.perf_counter() - start
-                print(f"❌ ERRO no ataque: {ex}\n")
-                results.append(
-                    AttackResult(bits, n, False, None, None, elapsed, {"error": str(ex)})
-                )
-                continue
-
-            elapsed = time.perf_counter() - start
-
-            # trata saída
-            if isinstance(out, tuple):
-                p, q = out[0], out[1]
-                if len(out) > 2:
-                    third = out[2]
-                    if isinstance(third, dict):
-                        extra.update(third)
-                    else:
-                        extra["rest"] = third
-            elif isinstance(out, dict):
-                p = out.get("p")
-                q = out.get("q")
-                extra = {k: v for k, v in out.items() if k not in ("p", "q")}
-
-            success = p is not None and q is not None and p * q == n
-
+                self._record_interrupted(results, bits, n, time.perf_counter() - start)
+                return
+            completed = True
+        finally:
+            # Ctrl+C ou qualquer erro (ex.: BrokenProcessPool): cancela o que
+            # ainda não começou e não espera pelos workers
+            executor.shutdown(wait=completed, cancel_futures=not completed)
+
+    def _print_header(self, bits: int, n: int) -> None:
+        if self.verbose:
+            print(f"\n==========================================")
+            print(f"🔎 Rodando teste com chave de {bits} bits")
+            print(f"==========================================\n")
+        # int -> str de n grande é caro: só formata se DEBUG estiver ativo
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("   n = %d", n)
+
+    def _record_interrupted(self, results: List[AttackResult], bits: int, n: int, elapsed: float) -> None:
+        if self.verbose:
+            print("⏹ Execução interrompida pelo usuário (Ctrl+C) durante este ataque.\n")
+
+        # registra essa chave como interrompida
+        results.append(
+            AttackResult(
+                bits,
+                n,
+                False,
+                None,
+                None,
+                elapsed,
+                {"interrupted": True},
+            )
+        )
+
+        if self.verbose:
+            print("⚠ Interrupção detectada. Gerando relatório parcial com os resultados até agora...\n")
+
+    def _make_result(self, bits: int, n: int, elapsed: float, out: Any, error: str | None) -> AttackResult:
+        verbose = self.verbose
+
+        if error is not None:
+            if verbose:
+                print(f"❌ ERRO no ataque: {error}\n")
+            return AttackResult(bits, n, False, None, None, elapsed, {"error": error})
+
+        extra: dict = {}
+        p = q = None
+
+        # trata saída
+        if isinstance(out, tuple):
+            p, q = out[0], out[1]
+            if len(out) > 2:
+                third = out[2]
+                if isinstance(third, dict):
+                    extra.update(third)
+                else:
+                    extra["rest"] = third
+        elif isinstance(out, dict):
+            p = out.get("p")
+            q = out.get("q")
+            extra = {k: v for k, v in out.items() if k not in ("p", "q")}
+
+        # n % p e n // p evitam multiplicar dois fatores grandes; q == n // p
+        # ainda rejeita um ataque que devolva o q errado
+        success = p is not None and q is not None and 1 < p < n and n % p == 0 and q == n // p
+
+        if verbose:
             if success:
                 print("✔ Sucesso! Fatores encontrados:")
                 print(f"   p = {p}")
@@ -189,12 +376,7 @@ class RSABenchmark:
             print(f"📊 Extra: {extra}")
             print()
 
-            results.append(
-                AttackResult(bits, n, success, p if success else None, q if success else None, elapsed, extra)
-            )
-
-        print("\n🏁 Fim dos ataques (normal ou interrompido)!\n")
-        return results
+        return AttackResult(bits, n, success, p if success else None, q if success else None, elapsed, extra)
 
     # ------------------------------
     #  Relatório final (agora método)
@@ -203,8 +385,25 @@ class RSABenchmark:
     def print_final_report(self, results: List[AttackResult]) -> None:
         print("\n================ RELATÓRIO FINAL ================\n")
 
+        # Uma única passada: totais gerais e acumuladores por tamanho de chave
+        # [total, ok, soma_tempo, soma_steps, n_steps]
+        stats: Dict[int, List[float]] = {}
+        success_count = 0
+        for r in results:
+            acc = stats.get(r.key_bits)
+            if acc is None:
+                acc = stats[r.key_bits] = [0, 0, 0.0, 0.0, 0]
+            acc[0] += 1
+            acc[2] += r.elapsed_seconds
+            if r.success:
+                acc[1] += 1
+                success_count += 1
+            steps = r.extra.get("steps")
+            if isinstance(steps, (int, float)):
+                acc[3] += steps
+                acc[4] += 1
+
         total = len(results)
-        success_count = sum(1 for r in results if r.success)
         fail_count = total - success_count
         success_rate = (success_count / total * 100) if total > 0 else 0.0
 
@@ -213,27 +412,14 @@ class RSABenchmark:
         print(f"Falharam / não quebradas                       : {fail_count}")
         print(f"Taxa de sucesso                                : {success_rate:.2f}%\n")
 
-        # Agrupar por tamanho de chave
-        stats: Dict[int, List[AttackResult]] = {}
-        for r in results:
-            stats.setdefault(r.key_bits, []).append(r)
-
         print("Resumo por tamanho de chave:\n")
         print(f"{'Bits':4} {'#Total':6} {'#OK':4} {'Sucesso%':9} {'t_med (s)':10} {'steps_med':10}")
         print("-" * 60)
 
-        for bits, group in sorted(stats.items()):
-            total_b = len(group)
-            ok_b = sum(1 for r in group if r.success)
-            rate_b = (ok_b / total_b * 100) if total_b > 0 else 0.0
-            avg_time = sum(r.elapsed_seconds for r in group) / total_b if total_b > 0 else 0.0
-
-            steps_list = []
-            for r in group:
-                steps = r.extra.get("steps")
-                if isinstance(steps, (int, float)):
-                    steps_list.append(steps)
-            avg_steps = sum(steps_list) / len(steps_list) if steps_list else 0.0
+        for bits, (total_b, ok_b, time_sum, steps_sum, steps_n) in sorted(stats.items()):
+            rate_b = ok_b / total_b * 100
+            avg_time = time_sum / total_b
+            avg_steps = steps_sum / steps_n if steps_n else 0.0
 
             print(
                 f"{bits:4} "
@@ -245,4 +431,3 @@ class RSABenchmark:
             )
 
         print("\n=================================================\n")
-
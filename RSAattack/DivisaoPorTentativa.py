@@ -1,9 +1,127 @@
+import array
 import math
+from itertools import compress
 from typing import Tuple, Dict, Any
 import pandas as pd
 from datetime import datetime
 import time
 
+try:
+    from numba import njit
+except ImportError:  # numba é opcional: sem ele, tudo roda em Python puro
+    njit = None
+
+
+def _sieve_primes(bound: int) -> Tuple[int, ...]:
+    """Crivo de Eratóstenes só nos ímpares: todos os primos < bound."""
+    if bound <= 2:
+        return ()
+    # sieve[i] representa o ímpar 2i + 1: metade da memória e das marcações
+    half = bound // 2
+    sieve = bytearray([1]) * half
+    sieve[0] = 0
+    for i in range(1, (math.isqrt(bound - 1) - 1) // 2 + 1):
+        if sieve[i]:
+            p = 2 * i + 1
+            start = p * p // 2
+            sieve[start::p] = bytes(len(range(start, half, p)))
+    # compress filtra em C, sem o laço Python sobre o bytearray
+    return (2,) + tuple(compress(range(1, bound, 2), sieve))
+
+
+# Primos < 2^16, calculados uma única vez na importação
+SIEVE_LIMIT = 1 << 16
+SMALL_PRIMES = _sieve_primes(SIEVE_LIMIT)
+
+# Roda mod 30: resíduos coprimos com 2·3·5 e o salto de cada um para o próximo
+_WHEEL_30_RESIDUES = (1, 7, 11, 13, 17, 19, 23, 29)
+_WHEEL_30_INCREMENTS = (6, 4, 2, 4, 2, 4, 6, 2)
+
+
+def _wheel_30_start(after: int) -> Tuple[int, int]:
+    """Primeiro candidato coprimo com 30 maior que `after` e seu índice na roda."""
+    base = after - after % 30
+    for i, r in enumerate(_WHEEL_30_RESIDUES):
+        if base + r > after:
+            return base + r, i
+    return base + 31, 0
+
+
+_WHEEL_30_START, _WHEEL_30_START_INDEX = _wheel_30_start(SMALL_PRIMES[-1])
+
+
+# ------------------------------
+#  Kernel nativo (numba) para n de até 63 bits
+# ------------------------------
+
+# Passos executados em código nativo entre duas verificações de timeout
+NATIVE_CHUNK_STEPS = 1 << 20
+
+if njit is not None:
+    @njit(cache=True, boundscheck=False)
+    def _wheel_scan_kernel(n, d, limit, increments, i, max_steps):
+        """Testa d, d+inc[i], ... até limit (ou max_steps); retorna (divisor|0, d, i, passos)."""
+        k = len(increments)
+        steps = 0
+        while d <= limit and steps < max_steps:
+            steps += 1
+            if n % d == 0:
+                return d, d, i, steps
+            d += increments[i]
+            i += 1
+            if i == k:
+                i = 0
+        return 0, d, i, steps
+
+
+def _native_wheel_scan(n, d, i, limit, increments, steps, timeout_flag):
+    """
+    Roda o kernel em blocos de NATIVE_CHUNK_STEPS, checando o timeout entre eles.
+    Retorna (divisor | None, passos, estourou_timeout).
+    """
+    while d <= limit:
+        found, d, i, done = _wheel_scan_kernel(n, d, limit, increments, i, NATIVE_CHUNK_STEPS)
+        steps += done
+        if found:
+            return found, steps, False
+        if timeout_flag:
+            elapsed = time.perf_counter() - timeout_flag.start_time
+            if elapsed > timeout_flag.timeout_seconds:
+                timeout_flag.timeout_flag = True
+                return None, steps, True
+    return None, steps, False
+
+
+def _use_native(n: int) -> bool:
+    return njit is not None and n.bit_length() <= 63
+
+
+_WHEEL_30_INCREMENTS_ARRAY = array.array("q", _WHEEL_30_INCREMENTS)
+
+# Roda mod 2310 = 2·3·5·7·11: 480 resíduos coprimos, saltos guardados como
+# inteiros C em array.array (coprimes[0] = 1, então d = 13 corresponde ao índice 1)
+_WHEEL_2310_PRIMES = (2, 3, 5, 7, 11)
+_WHEEL_2310_COPRIMES = [k for k in range(1, 2311) if math.gcd(k, 2310) == 1]
+_WHEEL_2310 = array.array("q", (
+    b - a for a, b in zip(_WHEEL_2310_COPRIMES, _WHEEL_2310_COPRIMES[1:] + [_WHEEL_2310_COPRIMES[0] + 2310])
+))
+_WHEEL_2310_SIZE = len(_WHEEL_2310)
+
+# Primos até 13 e o seu produto: um único gcd separa os n com fator pequeno
+_FAST_SMALL_PRIMES = (2, 3, 5, 7, 11, 13)
+_FAST_SMALL_PRODUCT = math.prod(_FAST_SMALL_PRIMES)
+
+
+def _fast_small_factor(n: int) -> int | None:
+    """Menor primo <= 13 que divide n propriamente, ou None."""
+    g = math.gcd(n, _FAST_SMALL_PRODUCT)
+    if g == 1:
+        return None
+    for p in _FAST_SMALL_PRIMES:
+        if g % p == 0:
+            return p if p < n else None
+    return None
+
 
 class TimeoutFlag:
     def __init__(self, timeout_seconds=10):
@@ -16,10 +134,31 @@ def trial_division_basic(n: int, e: int, timeout_flag=None, **kwargs) -> Tuple[i
     limit = math.isqrt(n)
     steps = 0
 
-    if n % 2 == 0:
-        return (2, n // 2, {"steps": 1, "method": "basic", "found_at": 2})
+    small = _fast_small_factor(n)
+    if small:
+        return (small, n // small, {"steps": 1, "method": "basic", "found_at": small})
 
-    for d in range(3, limit + 1, 2):
+    # Primeiro só primos do crivo: nenhum divisor composto é testado
+    for p in SMALL_PRIMES[1:]:
+        if p > limit:
+            return (None, None, {"steps": steps, "method": "basic", "limit": limit, "status": "prime"})
+        steps += 1
+        if n % p == 0:
+            return (p, n // p, {"steps": steps, "method": "basic", "found_at": p, "limit": limit})
+
+    # Além do crivo, continua com a roda mod 30
+    d = _WHEEL_30_START
+    i = _WHEEL_30_START_INDEX
+
+    if _use_native(n):
+        found, steps, timed_out = _native_wheel_scan(n, d, i, limit, _WHEEL_30_INCREMENTS_ARRAY, steps, timeout_flag)
+        if timed_out:
+            return (None, None, {"steps": steps, "method": "basic", "limit": limit, "status": "timeout"})
+        if found:
+            return (found, n // found, {"steps": steps, "method": "basic", "found_at": found, "limit": limit, "native": True})
+        return (None, None, {"steps": steps, "method": "basic", "limit": limit, "status": "prime", "native": True})
+
+    while d <= limit:
         steps += 1
         if steps % 100 == 0 and timeout_flag:
             elapsed = time.perf_counter() - timeout_flag.start_time
@@ -29,13 +168,19 @@ def trial_division_basic(n: int, e: int, timeout_flag=None, **kwargs) -> Tuple[i
         
         if n % d == 0:
             return (d, n // d, {"steps": steps, "method": "basic", "found_at": d, "limit": limit})
+        d += _WHEEL_30_INCREMENTS[i]
+        i = (i + 1) & 7
 
     return (None, None, {"steps": steps, "method": "basic", "limit": limit, "status": "prime"})
 
 
 def trial_division_with_primes(n: int, e: int, primes: list = None, timeout_flag=None, **kwargs) -> Tuple[int | None, int | None, Dict[str, Any]]:
+    small = _fast_small_factor(n)
+    if small:
+        return (small, n // small, {"steps": 1, "method": "with_primes", "found_at": small, "used_prime_list": True, "primes_tested": 1})
+
     if primes is None:
-        primes = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97]
+        primes = SMALL_PRIMES
     
     steps = 0
     limit = math.isqrt(n)
@@ -47,7 +192,8 @@ def trial_division_with_primes(n: int, e: int, primes: list = None, timeout_flag
         if n % p == 0:
             return (p, n // p, {"steps": steps, "method": "with_primes", "found_at": p, "used_prime_list": True, "primes_tested": steps})
 
-    d = 101
+    # Continua pelos ímpares a partir do último primo da lista
+    d = (primes[-1] + 1) | 1 if primes else 3
     composite_steps = 0
     while d <= limit:
         steps += 1
@@ -66,16 +212,24 @@ def trial_division_with_primes(n: int, e: int, primes: list = None, timeout_flag
 
 
 def trial_division_wheel(n: int, e: int, timeout_flag=None, **kwargs) -> Tuple[int | None, int | None, Dict[str, Any]]:
-    for p in [2, 3, 5]:
-        if n % p == 0:
-            return (p, n // p, {"steps": 1, "method": "wheel", "found_at": p, "wheel_optimized": True})
-
-    increments = [4, 2, 4, 2, 4, 6, 2, 6]
-    d = 7
-    steps = 3
-    i = 0
+    small = _fast_small_factor(n)
+    if small:
+        return (small, n // small, {"steps": 1, "method": "wheel", "found_at": small, "wheel_optimized": True})
+
+    increments = _WHEEL_2310
+    d = 13
+    steps = len(_WHEEL_2310_PRIMES)
+    i = 1
     limit = math.isqrt(n)
 
+    if _use_native(n):
+        found, steps, timed_out = _native_wheel_scan(n, d, i, limit, increments, steps, timeout_flag)
+        if timed_out:
+            return (None, None, {"steps": steps, "method": "wheel", "limit": limit, "status": "timeout"})
+        if found:
+            return (found, n // found, {"steps": steps, "method": "wheel", "found_at": found, "wheel_optimized": True, "pattern_cycles": steps // len(increments), "native": True})
+        return (None, None, {"steps": steps, "method": "wheel", "limit": limit, "status": "prime", "native": True})
+
     while d <= limit:
         steps += 1
         
@@ -88,7 +242,9 @@ def trial_division_wheel(n: int, e: int, timeout_flag=None, **kwargs) -> Tuple[i
         if n % d == 0:
             return (d, n // d, {"steps": steps, "method": "wheel", "found_at": d, "wheel_optimized": True, "pattern_cycles": steps // len(increments)})
         d += increments[i]
-        i = (i + 1) % len(increments)
+        i += 1
+        if i == _WHEEL_2310_SIZE:
+            i = 0
 
     return (None, None, {"steps": steps, "method": "wheel", "limit": limit, "status": "prime"})
 
@@ -122,6 +278,9 @@ def trial_division_factorization(n: int, e: int, timeout_flag=None, **kwargs) ->
             factors.append(d)
             n //= d
             factor_count += 1
+        if factor_count:
+            # n encolheu: o limite √n também
+            limit = math.isqrt(n)
         d += 2
 
     if n > 1:
@@ -146,8 +305,9 @@ def trial_division_progress(n: int, e: int, timeout_flag=None, **kwargs) -> Tupl
     steps = 0
     progress_logs = []
 
-    if n % 2 == 0:
-        return (2, n // 2, {"steps": 1, "method": "with_progress", "found_at": 2})
+    small = _fast_small_factor(n)
+    if small:
+        return (small, n // small, {"steps": 1, "method": "with_progress", "found_at": small})
 
     for d in range(3, limit + 1, 2):
         steps += 1
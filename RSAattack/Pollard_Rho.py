@@ -1,7 +1,13 @@
 from BaseAttack import RSABenchmark
-import math
 import random
 
+try:
+    # GMP: multiplicação/mod e gcd bem mais rápidos para n grande
+    from gmpy2 import mpz, gcd as _gcd
+except ImportError:
+    from math import gcd as _gcd
+    mpz = int
+
 
 def pollard_rho_attack(
     n: int,
@@ -10,13 +16,19 @@ def pollard_rho_attack(
     x_start: int = 2,
     max_iter: int = 10_000_000,
     progress_interval: int = 1000,
+    gcd_batch: int = 128,
 ):
     """
     Implementação do Pollard Rho (ρ), compatível com a interface do RSABenchmark.
 
-    - Usa tartaruga e lebre (Floyd cycle finding)
+    - Usa a variante de Brent (detecção de ciclo por potências de 2)
     - Função padrão: f(x) = x^2 + c (mod n)
     - c é aleatório se não fornecido
+    - Acumula o produto de |x - y| (mod n) e só calcula gcd a cada
+      `gcd_batch` passos; se o lote "passar do ponto" (gcd == n),
+      refaz o lote passo a passo para recuperar o fator
+    - Com gmpy2 instalado, a aritmética é feita em mpz (GMP)
+    - `iters` conta avaliações de f
     - Log de progresso igual ao Pollard p-1
     """
 
@@ -36,59 +48,86 @@ def pollard_rho_attack(
     else:
         c = c_start
 
-    # Tartaruga e lebre
-    x = x_start
-    y = x_start
+    m = gcd_batch
+    gcd = _gcd  # alias local: LOAD_FAST no laço
+    n = mpz(n)
+    c = mpz(c)
+    x_start = mpz(x_start)
+    x = y = x_start
 
     # Contador de iterações
     iters = 0
-
-    # Função iteradora f(x)
-    def f(z: int) -> int:
-        return (z * z + c) % n
+    next_log = progress_interval
 
     while iters < max_iter:
-        # Tartaruga: 1 passo
-        x = f(x)
-
-        # Lebre: 2 passos
-        y = f(f(y))
-
-        # d = gcd(|x - y|, n)
-        d = math.gcd(abs(x - y), n)
-
-        iters += 1
-
-        # Log periódico
-        if iters % progress_interval == 0:
-            print(f"   [Pollard Rho] iters={iters}, gcd(x-y, n)={d}, c={c}")
+        y = x_start
+        r = 1
+        q = 1
+        d = 1
+
+        while d == 1 and iters < max_iter:
+            # x guarda o ponto de referência; y avança r passos (sem passar de max_iter)
+            x = y
+            advance = min(r, max_iter - iters)
+            for _ in range(advance):
+                y = (y * y + c) % n
+            iters += advance
+
+            k = 0
+            while k < r and d == 1 and iters < max_iter:
+                ys = y
+                steps = min(m, r - k, max_iter - iters)
+                # o sinal de (x - y) não altera gcd(q, n): dispensa o abs
+                for _ in range(steps):
+                    y = (y * y + c) % n
+                    q = q * (x - y) % n
+                iters += steps
+                k += steps
+
+                # d = gcd(prod |x - y|, n), um por lote
+                d = gcd(q, n)
+
+                # Log periódico
+                if iters >= next_log:
+                    print(f"   [Pollard Rho] iters={iters}, gcd(x-y, n)={d}, c={c}")
+                    next_log = (iters // progress_interval + 1) * progress_interval
+
+            r *= 2
+
+        # lote passou do ponto: refaz passo a passo a partir de ys
+        # (no máximo `steps` avaliações de f, também contadas em iters)
+        if d == n:
+            while True:
+                ys = (ys * ys + c) % n
+                iters += 1
+                d = gcd(x - ys, n)
+                if d > 1:
+                    break
 
         # caso encontrou fator não trivial
         if 1 < d < n:
-            p = d
-            q = n // d
+            p = int(d)
+            q = int(n // d)
             return (p, q, {
                 "status": "factor_found",
                 "iters": iters,
-                "x_final": x,
-                "y_final": y,
-                "c": c,
+                "x_final": int(x),
+                "y_final": int(y),
+                "c": int(c),
             })
 
         # caso ciclo ruim: restart automático
         if d == n:
             # Reescolhe c e reinicia (prática comum)
-            c = random.randrange(1, n - 1)
-            x = x_start
-            y = x_start
+            c = mpz(random.randrange(1, n - 1))
 
     # Chegou no limite sem fatorar
     return (None, None, {
         "status": "max_iter_reached",
         "iters": iters,
-        "x_final": x,
-        "y_final": y,
-        "c": c,
+        "x_final": int(x),
+        "y_final": int(y),
+        "c": int(c),
     })
 
 
@@ -2,6 +2,23 @@ import math
 from typing import Optional, Tuple
 from BaseAttack import RSABenchmark
 
+def _qr_mask(m: int) -> int:
+    """Bit r ligado se r é resíduo quadrático módulo m."""
+    mask = 0
+    for x in range(m):
+        mask |= 1 << (x * x % m)
+    return mask
+
+
+# Quadrados perfeitos só deixam certos restos: passar nos quatro filtros
+# (mod 64, 63, 65, 11) elimina ~94% dos b2 antes do isqrt
+_QR64 = _qr_mask(64)
+_QR63 = _qr_mask(63)
+_QR65 = _qr_mask(65)
+_QR11 = _qr_mask(11)
+_QR_MOD = 63 * 65 * 11  # um único % no inteiro grande para os três últimos
+
+
 def fermat_factor(n: int, e: int = 0, max_iters: Optional[int] = None) -> Optional[Tuple[int,int]]:
     
     if n <= 1:
@@ -15,23 +32,22 @@ def fermat_factor(n: int, e: int = 0, max_iters: Optional[int] = None) -> Option
         a += 1
 
     it = 0
+    b2 = a*a - n
     while True:
-        b2 = a*a - n
-        if b2 < 0:
-            a += 1
-            it += 1
-            if max_iters and it > max_iters:
-                return None
-            continue
-
-        b = math.isqrt(b2)
-        if b*b == b2:
-            p = a - b
-            q = a + b
-            if 1 < p < n and 1 < q < n:
-                return (p, q) if p <= q else (q, p)
-            return None
+        # isqrt só para b2 que podem ser quadrados
+        if (_QR64 >> (b2 & 63)) & 1:
+            r = b2 % _QR_MOD
+            if (_QR63 >> (r % 63)) & 1 and (_QR65 >> (r % 65)) & 1 and (_QR11 >> (r % 11)) & 1:
+                b = math.isqrt(b2)
+                if b*b == b2:
+                    p = a - b
+                    q = a + b
+                    if 1 < p < n and 1 < q < n:
+                        return (p, q) if p <= q else (q, p)
+                    return None
 
+        # (a+1)^2 - n = b2 + 2a + 1: dispensa a multiplicação a*a
+        b2 += 2*a + 1
         a += 1
         it += 1
         if max_iters and it > max_iters:
@@ -1,5 +1,39 @@
 from BaseAttack import RSABenchmark
-import math
+
+try:
+    # GMP: powmod (Montgomery + janela deslizante) e gcd em C
+    from gmpy2 import mpz, powmod as _powmod, gcd as _gcd
+except ImportError:
+    from math import gcd as _gcd
+    mpz = int
+    _powmod = pow
+
+
+def _prime_power_steps():
+    """
+    Gera (m, p) para cada potência de primo m = p^k, em ordem crescente.
+
+    lcm(1..m) só muda nesses m, e muda exatamente por um fator p: basta
+    elevar a^p, em vez de a^m para todo m. Crivo incremental (dict de
+    compostos) + dict com a próxima potência de cada primo já visto.
+    """
+    composites = {}
+    powers = {}
+    m = 2
+    while True:
+        if m in composites:
+            for p in composites.pop(m):
+                composites.setdefault(m + p, []).append(p)
+            p = powers.pop(m, None)
+            if p is not None:
+                powers[m * p] = p
+                yield m, p
+        else:
+            composites[m * m] = [m]
+            powers[m * m] = m
+            yield m, m
+        m += 1
+
 
 def pollard_p_minus_1_attack(
     n: int,
@@ -7,41 +41,83 @@ def pollard_p_minus_1_attack(
     a_start: int = 2,
     max_iter: int = 1000000000,
     progress_interval: int = 1000,
+    gcd_batch: int = 128,
 ):
-    a = a_start
-    i = 2
+    """
+    Pollard p-1, estágio 1 com expoente E = lcm(1..B) crescente.
+
+    - Só faz a <- a^p (mod n) quando i é potência de primo p^k
+    - Acumula o produto de (a - 1) (mod n) e só calcula gcd a cada
+      `gcd_batch` passos; se o lote "passar do ponto" (gcd == n),
+      refaz o lote passo a passo a partir do a salvo
+    - Com gmpy2 instalado, a aritmética é feita em mpz (GMP)
+    - `iters` conta exponenciações; `i_final` é o último i = p^k usado
+    """
+    powmod = _powmod  # aliases locais: LOAD_FAST no laço
+    gcd = _gcd
+    n = mpz(n)
+    a = mpz(a_start)
+    steps = _prime_power_steps()
+    i = 1
     iters = 0
+    next_log = progress_interval
 
     while iters < max_iter:
-        # a <- a^i (mod n)
-        a = pow(a, i, n)
-
-        # d = gcd(a-1, n)
-        d = math.gcd(a - 1, n)
+        a_saved = a
+        batch = []
+        acc = mpz(1)
+        for _ in range(min(gcd_batch, max_iter - iters)):
+            i, p = next(steps)
+            a = powmod(a, p, n)
+            acc = acc * (a - 1) % n
+            batch.append((i, p))
 
-        iters += 1
+        # d = gcd(prod (a-1), n), um por lote
+        d = gcd(acc, n)
+        iters += len(batch)
 
         # log periódico opcional
-        if iters % progress_interval == 0:
+        if iters >= next_log:
             print(f"   [Pollard p-1] iters={iters}, i={i}, gcd(a-1, n)={d}")
+            next_log = (iters // progress_interval + 1) * progress_interval
+
+        if d == 1:
+            continue
+
+        # lote passou do ponto: refaz passo a passo a partir de a_saved
+        if d == n:
+            iters -= len(batch)
+            a = a_saved
+            for i, p in batch:
+                a = powmod(a, p, n)
+                iters += 1
+                d = gcd(a - 1, n)
+                if d > 1:
+                    break
 
         # se achou fator não trivial
         if 1 < d < n:
-            p = d
-            q = n // d
+            p = int(d)
+            q = int(n // d)
             return (p, q, {
                 "iters": iters,
                 "i_final": i,
-                "a_final": a,
+                "a_final": int(a),
                 "status": "factor_found",
             })
 
-        i += 1
+        # a ≡ 1 (mod p) e (mod q) no mesmo passo: E maior não ajuda
+        return (None, None, {
+            "iters": iters,
+            "i_final": i,
+            "a_final": int(a),
+            "status": "trivial_gcd",
+        })
 
     return (None, None, {
         "iters": iters,
-        "i_final": i - 1,
-        "a_final": a,
+        "i_final": i,
+        "a_final": int(a),
         "status": "max_iter_reached",
     })
 
@@ -10,6 +10,14 @@ def decriptar_numero(c: int, d: int, n: int) -> int:
     m_decripitado = pow(c, d, n)
     return m_decripitado
 
+def decriptar_numero_crt(c: int, p: int, q: int, dp: int, dq: int, qinv: int) -> int:
+    # Teorema Chinês do Resto: duas exponenciações com metade dos bits
+    # no lugar de uma com n inteiro (~4x mais rápido)
+    m1 = pow(c, dp, p)
+    m2 = pow(c, dq, q)
+    h = (qinv * (m1 - m2)) % p
+    return m2 + h * q
+
 def encriptar_texto(texto: str, chave_publica: tuple[int, int]) -> list[int]:
     e, n = chave_publica 
     
@@ -19,11 +27,15 @@ def encriptar_texto(texto: str, chave_publica: tuple[int, int]) -> list[int]:
     
     return encriptado
 
-def decriptar_texto(numero_criptografado: int, chave_privada: tuple[int, int]) -> str:
-    
-    d, n = chave_privada 
+def decriptar_texto(numero_criptografado: int, chave_privada: tuple[int, ...]) -> str:
     
-    numero_decriptado = decriptar_numero(numero_criptografado, d, n)
+    # (d, n, p, q, dp, dq, qinv) usa CRT; (d, n) cai no pow(c, d, n) direto
+    if len(chave_privada) == 7:
+        d, n, p, q, dp, dq, qinv = chave_privada
+        numero_decriptado = decriptar_numero_crt(numero_criptografado % n, p, q, dp, dq, qinv)
+    else:
+        d, n = chave_privada
+        numero_decriptado = decriptar_numero(numero_criptografado, d, n)
     
     texto = numero_para_texto(numero_decriptado)
     
@@ -1,17 +1,25 @@
+import math
 import random
-from math_utils import mdc, inverso_multiplicativo, eh_primo
+import secrets
+from math_utils import eh_primo
+
+# Candidatos sorteados por chamada ao gerador do sistema
+LOTE_CANDIDATOS = 256
 
 def gerar_primo(bits=8):
-    minimo = 2 ** (bits - 1)
-    maximo = 2 ** bits - 1
+    topo = 1 << (bits - 1)
+    mascara = (1 << bits) - 1
+    tam = (bits + 7) // 8
     
     while True:
-        candidato = random.randint(minimo, maximo)
-        if candidato % 2 == 0:
-            candidato += 1
+        # Um único pedido de bytes aleatórios rende LOTE_CANDIDATOS candidatos
+        bloco = secrets.token_bytes(tam * LOTE_CANDIDATOS)
+        for i in range(0, len(bloco), tam):
+            # Força o bit mais alto (tamanho exato) e o bit 0 (ímpar)
+            candidato = (int.from_bytes(bloco[i:i + tam], "big") & mascara) | topo | 1
             
-        if eh_primo(candidato):
-            return candidato
+            if eh_primo(candidato):
+                return candidato
 
 def gerar_chaves(tamanho_bits=8):
 
@@ -27,14 +35,16 @@ def gerar_chaves(tamanho_bits=8):
     
     e = 65537
     
-    if e >= phi_n or mdc(e, phi_n) != 1:
+    if e >= phi_n or math.gcd(e, phi_n) != 1:
         e = random.randrange(3, phi_n, 2)
-        while mdc(e, phi_n) != 1:
+        while math.gcd(e, phi_n) != 1:
             e = random.randrange(3, phi_n, 2)
     
-    d = inverso_multiplicativo(e, phi_n)
+    # Inverso modular nativo (Python >= 3.8), já devolvido em [0, phi_n)
+    d = pow(e, -1, phi_n)
     
     chave_publica = (e, n)
-    chave_privada = (d, n)
+    # Parâmetros do CRT vão junto da chave privada para decriptar mais rápido
+    chave_privada = (d, n, p, q, d % (p - 1), d % (q - 1), pow(q, -1, p))
     
     return (chave_publica, chave_privada)
\ No newline at end of file
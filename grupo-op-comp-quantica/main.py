@@ -44,7 +44,7 @@ def simulacao_rapida():
     try:
         chave_publica, chave_privada = gerar_chaves(tamanho_bits=bits_primo)
         e, n = chave_publica
-        d, _ = chave_privada
+        d = chave_privada[0]
         print(f"      ✅ Chaves geradas!")
         print(f"      🔑 Pública (e={e}, n={n})")
         print(f"      🗝️  Privada (d={d}, n={n})")
@@ -160,7 +160,9 @@ def exibir_chaves(chave_publica, chave_privada):
     else:
         print("\n--- Chaves Atuais ---")
         print(f"Chave Pública (e, n): {chave_publica}")
-        print(f"Chave Privada (d, n): {chave_privada}")
+        print(f"Chave Privada (d, n): {chave_privada[:2]}")
+        if len(chave_privada) == 7:
+            print(f"Parâmetros CRT (p, q, dp, dq, qinv): {chave_privada[2:]}")
 
 def sobre_rsa():
     print("\n--- Sobre o RSA ---")
@@ -170,6 +172,7 @@ def sobre_rsa():
     print("- Teste de primalidade Miller-Rabin para geração rápida de primos grandes.")
     print("- Algoritmo de Euclides Estendido para cálculo eficiente do inverso modular.")
     print("- Exponenciação modular para encriptação/decriptação rápida.")
+    print("- Decriptação pelo Teorema Chinês do Resto (CRT), usando p e q.")
     print("Importante: O valor numérico do texto deve ser menor que o módulo n da chave.")
 
 def main():
@@ -1,5 +1,14 @@
 import math
-import random
+from secrets import randbelow
+
+try:
+    # GMP é opcional: sem gmpy2, tudo roda só com a stdlib
+    from gmpy2 import gcd as _gcd, invert as _invert, mpz as _mpz, powmod as _powmod
+except ImportError:
+    _gcd = math.gcd
+    _invert = None
+    _mpz = int
+    _powmod = pow
 
 def mdc(a, b):
     """
@@ -7,14 +16,20 @@ def mdc(a, b):
     Saída: int (máximo divisor comum)
     Exemplo: mdc(48, 18) → 6
     """
-    return math.gcd(a, b)
+    return int(_gcd(a, b))
 
 def inverso_multiplicativo(e, phi_n):
     """
     Entrada: e (int), phi_n (int)
     Saída: d (int) tal que (e * d) % phi_n == 1
-    Usa o Algoritmo de Euclides Estendido.
+    Usa gmpy2.invert (GMP) se disponível; senão, Euclides Estendido.
     """
+    if _invert is not None:
+        try:
+            return int(_invert(e, phi_n))
+        except ZeroDivisionError:
+            raise Exception("e não é invertível (não é coprimo de phi_n)") from None
+
     t, newt = 0, 1
     r, newr = phi_n, e
 
@@ -31,30 +46,78 @@ def inverso_multiplicativo(e, phi_n):
 
     return t
 
+# Primos ímpares até 997 e o seu produto: um único gcd substitui ~167 divisões
+_PRIMOS_PEQUENOS = tuple(p for p in range(3, 998, 2) if all(p % q for q in range(3, math.isqrt(p) + 1, 2)))
+_CONJUNTO_PRIMOS_PEQUENOS = frozenset(_PRIMOS_PEQUENOS)
+_PRODUTO_PRIMOS_PEQUENOS = math.prod(_PRIMOS_PEQUENOS)
+# Menor composto sem fator <= 997 é 1009^2: abaixo disso, passar no filtro já prova primalidade
+_LIMITE_SO_FILTRO = 1009 * 1009
+
+# (limite, bases): para todo n < limite, Miller-Rabin nessas bases é exato
+_TESTEMUNHAS_DETERMINISTICAS = (
+    (2047, (2,)),
+    (1373653, (2, 3)),
+    (9080191, (31, 73)),
+    (25326001, (2, 3, 5)),
+    (3215031751, (2, 3, 5, 7)),
+    (4759123141, (2, 7, 61)),
+    (1122004669633, (2, 13, 23, 1662803)),
+    (2152302898747, (2, 3, 5, 7, 11)),
+    (3474749660383, (2, 3, 5, 7, 11, 13)),
+    (341550071728321, (2, 3, 5, 7, 11, 13, 17)),
+    (1 << 64, (2, 325, 9375, 28178, 450775, 9780504, 1795265022)),
+    (318665857834031151167461, (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)),
+)
+
 def eh_primo(n, k=40):
     """
     Entrada: n (int), k (int) - número de testes
     Saída: bool (True se provavelmente primo, False se composto)
-    Usa o teste de Miller-Rabin.
+    Usa o teste de Miller-Rabin: bases fixas (resultado exato) até ~3.2e23,
+    k bases aleatórias acima disso.
     """
     if n <= 1: return False
     if n <= 3: return True
     if n % 2 == 0: return False
 
+    # Filtro barato: a maioria dos ímpares tem um fator primo <= 997 e
+    # é descartada aqui, sem nenhuma exponenciação modular
+    if _gcd(n, _PRODUTO_PRIMOS_PEQUENOS) != 1:
+        return n in _CONJUNTO_PRIMOS_PEQUENOS
+    if n < _LIMITE_SO_FILTRO:
+        return True
+
     # Escreve n-1 como 2^r * d
     r, d = 0, n - 1
     while d % 2 == 0:
         r += 1
         d //= 2
 
-    for _ in range(k):
-        a = random.randint(2, n - 2)
-        x = pow(a, d, n)
-        if x == 1 or x == n - 1:
+    # Com gmpy2, a exponenciação roda em mpz (GMP, redução de Montgomery)
+    powmod = _powmod
+    n, d = _mpz(n), _mpz(d)
+    nm1 = n - 1  # calculado uma vez: evita uma subtração de bignum por comparação
+
+    for limite, testemunhas in _TESTEMUNHAS_DETERMINISTICAS:
+        if n < limite:
+            bases = testemunhas
+            break
+    else:
+        # Bases em [2, n-2] do gerador do sistema (CSPRNG), não do Mersenne Twister
+        limite_base = int(n) - 3
+        bases = (2 + randbelow(limite_base) for _ in range(k))
+
+    for a in bases:
+        a %= n
+        if a == 0:
+            continue
+        x = powmod(a, d, n)
+        if x == 1 or x == nm1:
             continue
         for _ in range(r - 1):
-            x = pow(x, 2, n)
-            if x == n - 1:
+            # x*x usa a rotina de quadrado do GMP (mpz) e evita uma chamada
+            x = x * x % n
+            if x == nm1:
                 break
         else:
             return False
@@ -1,16 +1,20 @@
 from dataclasses import asdict
 from datetime import timezone
-from fastapi import APIRouter, HTTPException, status
+import functools
+from types import MappingProxyType
+from fastapi import APIRouter, HTTPException, Response, status
 
 import oqs
 
 from app.api.deps import CurrentUser
 from app.core.config import settings
-from app.core.pqc_sessions import pqc_session_manager
+from app.core.pqc_sessions import pqc_session_manager, wipe_bytes
 from app.models import (
     Message,
     PQCKEMAlgorithm,
     PQCKEMAlgorithms,
+    PQCKEMHandshakeBatchRequest,
+    PQCKEMHandshakeBatchResponse,
     PQCKEMHandshakeRequest,
     PQCKEMHandshakeResponse,
     PQCHandshakeInitRequest,
@@ -18,14 +22,17 @@ from app.models import (
     PQCHandshakeCompleteRequest,
     PQCHandshakeCompleteResponse,
 )
-from app.services.pqc import PQCService, _b64encode, _b64decode
+from app.services.pqc import KEMDetails, KEMHandshake, PQCService, _b64decode
 
 router = APIRouter(prefix="/pqc", tags=["pqc"])
 service = PQCService()
 
+# Corpo JSON de /pqc/kems: a lista é fixa no processo, serializada uma vez
+_KEMS_JSON: bytes | None = None
+
 
 @router.get("/kems", response_model=PQCKEMAlgorithms)
-def list_kem_algorithms() -> PQCKEMAlgorithms:
+def list_kem_algorithms() -> Response:
     """
     Lista todos os algoritmos KEM (Key Encapsulation Mechanism) disponíveis.
     
@@ -37,11 +44,11 @@ def list_kem_algorithms() -> PQCKEMAlgorithms:
     - BIKE: Baseado em códigos, chaves compactas
     - Classic-McEliece: Ultra conservador, chaves grandes
     """
-    kems = [
-        PQCKEMAlgorithm(**asdict(details))
-        for details in service.list_kem_algorithms()
-    ]
-    return PQCKEMAlgorithms(data=kems)
+    global _KEMS_JSON
+    if _KEMS_JSON is None:
+        kems = [_kem_algorithm(details) for details in service.list_kem_algorithms()]
+        _KEMS_JSON = PQCKEMAlgorithms(data=kems).model_dump_json().encode()
+    return Response(content=_KEMS_JSON, media_type="application/json")
 
 
 @router.post("/handshake/init", response_model=PQCHandshakeInitResponse)
@@ -62,7 +69,7 @@ def init_pqc_handshake(
     - Chave privada armazenada temporariamente (2 minutos)
     - Handshake_id único e seguro
     """
-    algorithm = payload.algorithm or settings.DEFAULT_PQC_KEM
+    algorithm = _resolve_algorithm(payload.algorithm)
     
     try:
         # Gera par de chaves KEM
@@ -79,7 +86,7 @@ def init_pqc_handshake(
         return PQCHandshakeInitResponse(
             handshake_id=handshake.handshake_id,
             algorithm=algorithm,
-            public_key=_b64encode(keypair.public_key),
+            public_key=keypair.public_key_b64,
             expires_at=handshake.expires_at.isoformat(),
         )
         
@@ -146,6 +153,8 @@ def complete_pqc_handshake(
             handshake_id=payload.handshake_id,
             shared_secret=shared_secret,
         )
+        # Handshake consumido: zera também a cópia lida aqui (no Redis é outra)
+        wipe_bytes(handshake.secret_key)
         
         return PQCHandshakeCompleteResponse(
             session_id=session.session_id,
@@ -224,9 +233,7 @@ def generate_kem_handshake(
     
     Útil para entender como KEM funciona e validar implementações.
     """
-    algorithm = (
-        payload.algorithm if payload and payload.algorithm else settings.DEFAULT_PQC_KEM
-    )
+    algorithm = _resolve_algorithm(payload.algorithm if payload else None)
     try:
         handshake = service.generate_kem_handshake(algorithm)
     except oqs.MechanismNotSupportedError as exc:
@@ -240,7 +247,80 @@ def generate_kem_handshake(
             detail=f"Unable to perform KEM handshake: {exc}",
         ) from exc
 
-    details = PQCKEMAlgorithm(**asdict(handshake.details))
+    return _handshake_response(handshake)
+
+
+@router.post("/kem/handshake/batch", response_model=PQCKEMHandshakeBatchResponse)
+def generate_kem_handshakes_batch(
+    payload: PQCKEMHandshakeBatchRequest,
+) -> PQCKEMHandshakeBatchResponse:
+    """
+    ⚠️  DEMONSTRAÇÃO APENAS - NÃO USAR EM PRODUÇÃO!
+    
+    Mesmo handshake de /pqc/kem/handshake para vários algoritmos (até 16),
+    executados em paralelo: útil para comparar algoritmos lado a lado.
+    """
+    for algorithm in payload.algorithms:
+        _reject_large_kem(algorithm)
+    try:
+        handshakes = service.generate_kem_handshakes_batch(payload.algorithms)
+    except oqs.MechanismNotSupportedError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"KEM algorithm is not available: {exc}",
+        ) from exc
+    except RuntimeError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Unable to perform KEM handshake: {exc}",
+        ) from exc
+
+    return PQCKEMHandshakeBatchResponse(
+        data=[_handshake_response(handshake) for handshake in handshakes]
+    )
+
+
+def _resolve_algorithm(requested: str | None) -> str:
+    """Algoritmo pedido, o DEFAULT_PQC_KEM configurado ou o recomendado (rápido)."""
+    algorithm = requested or settings.DEFAULT_PQC_KEM or service.recommended_algorithm()
+    _reject_large_kem(algorithm)
+    return algorithm
+
+
+def _reject_large_kem(algorithm: str) -> None:
+    """
+    Recusa KEMs com chave pública acima de PQC_MAX_PUBLIC_KEY_BYTES
+    (ex.: Classic-McEliece): base64 e rede dominariam cada handshake.
+    """
+    limit = settings.PQC_MAX_PUBLIC_KEY_BYTES
+    if limit is None:
+        return
+    details = service.get_kem_details(algorithm)
+    if details is None:
+        return  # a rota responde 400 ao tentar usar o algoritmo
+    if details.length_public_key > limit:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"KEM algorithm '{algorithm}' has a {details.length_public_key}-byte "
+                f"public key (limit {limit}, see PQC_MAX_PUBLIC_KEY_BYTES)"
+            ),
+        )
+
+
+@functools.cache
+def _kem_algorithm_fields(details: KEMDetails) -> MappingProxyType[str, object]:
+    """Campos já validados de um KEMDetails (imutável): convertidos uma vez."""
+    return MappingProxyType(PQCKEMAlgorithm(**asdict(details)).model_dump())
+
+
+def _kem_algorithm(details: KEMDetails) -> PQCKEMAlgorithm:
+    """Modelo de resposta novo a cada chamada (sem revalidar os campos em cache)."""
+    return PQCKEMAlgorithm.model_construct(**_kem_algorithm_fields(details))
+
+
+def _handshake_response(handshake: KEMHandshake) -> PQCKEMHandshakeResponse:
+    details = _kem_algorithm(handshake.details)
     return PQCKEMHandshakeResponse(
         algorithm=handshake.algorithm,
         public_key=handshake.public_key,
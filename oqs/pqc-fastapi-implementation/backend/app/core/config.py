@@ -38,8 +38,16 @@ class Settings(BaseSettings):
     ENVIRONMENT: Literal["local", "staging", "production"] = "local"
     
     # Post-Quantum Cryptography Settings
-    DEFAULT_PQC_KEM: str = "Kyber512"
+    # Vazio = primeiro disponível de PQCService.FAST_DEFAULTS (ML-KEM-768, ...)
+    DEFAULT_PQC_KEM: str | None = None
+    # KEMs com chave pública maior que isto são recusadas; None = sem limite
+    PQC_MAX_PUBLIC_KEY_BYTES: int | None = 64 * 1024
+    # Pares KEM pré-gerados em background para o algoritmo padrão; 0 = desativado
+    PQC_PREKEY_POOL_SIZE: int = 0
     PQC_SESSION_TTL_MINUTES: int = 5  # Sessões PQC expiram em 5 minutos
+    PQC_CLEANUP_INTERVAL_SECONDS: float = 5  # Limpeza de expirados em background
+    # Redis compartilhado para sessões PQC (multi-instância); vazio = memória
+    PQC_REDIS_URL: str | None = None
 
     BACKEND_CORS_ORIGINS: Annotated[
         list[AnyUrl] | str, BeforeValidator(parse_cors)
@@ -18,17 +18,32 @@ Vantagens:
 
 from __future__ import annotations
 
+import asyncio
+import base64
+import binascii
 import hashlib
+import heapq
+import hmac
+import json
+import logging
 import secrets
+import threading
+import time
 import uuid
+from contextvars import ContextVar
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Dict
+from typing import Dict, List, Set, Tuple
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+
+# slots: sem __dict__ por instância; frozen: campos nunca reatribuídos (o
+# conteúdo dos bytearrays ainda é zerado por wipe_bytes). eq=False: igualdade
+# e hash por identidade; o __hash__ gerado por frozen falharia nos bytearrays
+@dataclass(frozen=True, slots=True, eq=False)
 class PendingHandshake:
     """
     Representa um handshake PQC em andamento (primeira etapa).
@@ -39,13 +54,14 @@ class PendingHandshake:
     handshake_id: str
     user_id: uuid.UUID
     algorithm: str
-    secret_key: bytes  # Chave privada KEM (temporária)
+    secret_key: bytearray  # Chave privada KEM (temporária; zerada após o uso)
     public_key: bytes
     created_at: datetime
     expires_at: datetime
+    expires_at_ts: float  # time.monotonic(): usado nas comparações de expiração
 
 
-@dataclass
+@dataclass(frozen=True, slots=True, eq=False)
 class PQCSession:
     """
     Representa uma sessão PQC ativa após handshake completo.
@@ -58,16 +74,126 @@ class PQCSession:
     session_id: str
     user_id: uuid.UUID
     algorithm: str
-    shared_secret_hash: str  # SHA-256 do shared secret
+    shared_secret_hash: bytearray  # SHA-256 do shared secret (32 bytes; zerado ao sair)
     created_at: datetime
     expires_at: datetime
+    expires_at_ts: float  # time.monotonic(): usado nas comparações de expiração
+
+
+# Handshake pendente expira em 2 minutos
+HANDSHAKE_TTL = timedelta(minutes=2)
+
+_urlsafe_b64encode = base64.urlsafe_b64encode
+
+# Instante (UTC) do request atual, definido pelo middleware em app/main.py:
+# todos os created_at/expires_at de um mesmo request usam uma só leitura do relógio
+request_now: ContextVar[datetime | None] = ContextVar("pqc_request_now", default=None)
+
+
+def _utc_now() -> datetime:
+    """Instante do request em andamento; fora de um request, o relógio atual."""
+    now = request_now.get()
+    return now if now is not None else datetime.now(timezone.utc)
+
+
+def _new_id() -> str:
+    """
+    Id aleatório de 192 bits, url-safe.
+    
+    24 bytes viram exatamente 32 caracteres base64: sem padding para remover
+    (como o rstrip que token_urlsafe faz a cada chamada).
+    """
+    return _urlsafe_b64encode(secrets.token_bytes(24)).decode("ascii")
+
+
+# session_id = user_id (16 bytes) + nonce (16) + HMAC-SHA256 truncado (16):
+# a posse do usuário é conferida pelo próprio id, sem ler a sessão
+_SESSION_ID_KEY = hashlib.sha256(b"pqc-session-id:" + settings.SECRET_KEY.encode()).digest()
+_SESSION_NONCE_BYTES = 16
+_SESSION_TAG_BYTES = 16
+_SESSION_ID_BYTES = 16 + _SESSION_NONCE_BYTES + _SESSION_TAG_BYTES
+
+
+def _session_tag(user_and_nonce: bytes) -> bytes:
+    return hmac.new(_SESSION_ID_KEY, user_and_nonce, hashlib.sha256).digest()[:_SESSION_TAG_BYTES]
+
+
+def _new_session_id(user_id: uuid.UUID) -> str:
+    """Id de sessão (48 bytes, 64 chars url-safe) amarrado ao user_id por HMAC."""
+    user_and_nonce = user_id.bytes + secrets.token_bytes(_SESSION_NONCE_BYTES)
+    return _urlsafe_b64encode(user_and_nonce + _session_tag(user_and_nonce)).decode("ascii")
+
+
+def _session_user_id(session_id: str) -> uuid.UUID | None:
+    """
+    Extrai o dono de um id emitido por este servidor, sem consultar o
+    armazenamento (HMAC comparado em tempo constante); None se inválido.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(session_id)
+    except (binascii.Error, ValueError):
+        return None
+    if len(raw) != _SESSION_ID_BYTES:
+        return None
+    if not hmac.compare_digest(raw[-_SESSION_TAG_BYTES:], _session_tag(raw[:-_SESSION_TAG_BYTES])):
+        return None
+    return uuid.UUID(bytes=raw[:16])
+
+
+def _session_id_belongs_to(session_id: str, user_id: uuid.UUID) -> bool:
+    """Confere se o id foi emitido por este servidor para este usuário."""
+    return _session_user_id(session_id) == user_id
+
+
+def wipe_bytes(buf: bytes | bytearray) -> None:
+    """Zera uma chave em bytearray no lugar (bytes imutáveis são ignorados)."""
+    if isinstance(buf, bytearray):
+        buf[:] = bytes(len(buf))
+
+
+def _new_pending_handshake(
+    user_id: uuid.UUID,
+    algorithm: str,
+    secret_key: bytearray,
+    public_key: bytes,
+) -> PendingHandshake:
+    """Monta um PendingHandshake novo (comum aos dois gerenciadores)."""
+    now = _utc_now()
+    return PendingHandshake(
+        handshake_id=_new_id(),
+        user_id=user_id,
+        algorithm=algorithm,
+        secret_key=secret_key,
+        public_key=public_key,
+        created_at=now,
+        expires_at=now + HANDSHAKE_TTL,
+        expires_at_ts=time.monotonic() + HANDSHAKE_TTL.total_seconds(),
+    )
+
+
+def _new_session(handshake: PendingHandshake, shared_secret: bytes) -> PQCSession:
+    """Monta a PQCSession que sucede um handshake (comum aos dois gerenciadores)."""
+    # Gera hash SHA-256 do shared secret
+    secret_hash = bytearray(hashlib.sha256(shared_secret).digest())
+    
+    now = _utc_now()
+    ttl = timedelta(minutes=settings.PQC_SESSION_TTL_MINUTES)
+    return PQCSession(
+        session_id=_new_session_id(handshake.user_id),
+        user_id=handshake.user_id,
+        algorithm=handshake.algorithm,
+        shared_secret_hash=secret_hash,
+        created_at=now,
+        expires_at=now + ttl,
+        expires_at_ts=time.monotonic() + ttl.total_seconds(),
+    )
 
 
 class PQCSessionManager:
     """
     Gerenciador de sessões PQC em memória.
     
-    NOTA: Para produção, considere usar Redis ou similar para:
+    NOTA: Para produção, use RedisPQCSessionManager (PQC_REDIS_URL) para:
     - Compartilhar sessões entre múltiplas instâncias da API
     - Persistência além da memória do processo
     - Melhor performance em escala
@@ -79,12 +205,23 @@ class PQCSessionManager:
         
         # Sessões PQC ativas
         self._active_sessions: Dict[str, PQCSession] = {}
+        
+        # Índice user_id -> session_ids: revoke_all sem varrer todas as sessões
+        self._user_sessions: Dict[uuid.UUID, Set[str]] = {}
+        
+        # Min-heaps (expires_at_ts, id): a limpeza só visita o que expirou
+        self._handshake_expiry: List[Tuple[float, str]] = []
+        self._session_expiry: List[Tuple[float, str]] = []
+        
+        # Rotas sync rodam no threadpool e a limpeza no event loop: índice
+        # por usuário e heaps só mudam com este lock
+        self._lock = threading.Lock()
     
     def create_pending_handshake(
         self,
         user_id: uuid.UUID,
         algorithm: str,
-        secret_key: bytes,
+        secret_key: bytearray,
         public_key: bytes,
     ) -> PendingHandshake:
         """
@@ -93,30 +230,24 @@ class PQCSessionManager:
         O cliente receberá a chave pública e o handshake_id.
         Ele deve encapsular um segredo e enviar o ciphertext de volta.
         """
-        handshake_id = secrets.token_urlsafe(32)
-        now = datetime.now(timezone.utc)
-        # Handshake pendente expira em 2 minutos
-        expires_at = now + timedelta(minutes=2)
-        
-        handshake = PendingHandshake(
-            handshake_id=handshake_id,
-            user_id=user_id,
-            algorithm=algorithm,
-            secret_key=secret_key,
-            public_key=public_key,
-            created_at=now,
-            expires_at=expires_at,
-        )
+        handshake = _new_pending_handshake(user_id, algorithm, secret_key, public_key)
         
-        self._pending_handshakes[handshake_id] = handshake
+        with self._lock:
+            self._pending_handshakes[handshake.handshake_id] = handshake
+            heapq.heappush(self._handshake_expiry, (handshake.expires_at_ts, handshake.handshake_id))
         return handshake
     
     def get_pending_handshake(self, handshake_id: str) -> PendingHandshake | None:
         """
-        Recupera um handshake pendente e remove expirados.
+        Recupera um handshake pendente ainda válido.
+        
+        Expirados são removidos por run_cleanup_loop; aqui basta conferir
+        a expiração do próprio handshake.
         """
-        self._cleanup_expired_handshakes()
-        return self._pending_handshakes.get(handshake_id)
+        handshake = self._pending_handshakes.get(handshake_id)
+        if handshake is None or time.monotonic() > handshake.expires_at_ts:
+            return None
+        return handshake
     
     def complete_handshake(
         self,
@@ -127,40 +258,32 @@ class PQCSessionManager:
         Completa o handshake e cria uma sessão PQC ativa.
         
         Segurança:
-        - Remove o handshake pendente (chave privada descartada)
+        - Remove o handshake pendente (chave privada zerada)
         - Cria sessão com HASH do shared secret
         - Shared secret original não é armazenado
         """
         handshake = self._pending_handshakes.pop(handshake_id, None)
         if not handshake:
             raise ValueError("Handshake not found or expired")
-        
-        # Gera hash SHA-256 do shared secret
-        secret_hash = hashlib.sha256(shared_secret).hexdigest()
+        wipe_bytes(handshake.secret_key)
         
         # Cria sessão PQC
-        session_id = secrets.token_urlsafe(32)
-        now = datetime.now(timezone.utc)
-        expires_at = now + timedelta(minutes=settings.PQC_SESSION_TTL_MINUTES)
-        
-        session = PQCSession(
-            session_id=session_id,
-            user_id=handshake.user_id,
-            algorithm=handshake.algorithm,
-            shared_secret_hash=secret_hash,
-            created_at=now,
-            expires_at=expires_at,
-        )
+        session = _new_session(handshake, shared_secret)
         
-        self._active_sessions[session_id] = session
+        with self._lock:
+            self._active_sessions[session.session_id] = session
+            self._user_sessions.setdefault(session.user_id, set()).add(session.session_id)
+            heapq.heappush(self._session_expiry, (session.expires_at_ts, session.session_id))
         return session
     
     def get_session(self, session_id: str) -> PQCSession | None:
         """
-        Recupera uma sessão PQC ativa.
+        Recupera uma sessão PQC ativa (None se inexistente ou expirada).
         """
-        self._cleanup_expired_sessions()
-        return self._active_sessions.get(session_id)
+        session = self._active_sessions.get(session_id)
+        if session is None or time.monotonic() > session.expires_at_ts:
+            return None
+        return session
     
     def validate_session(
         self,
@@ -170,76 +293,315 @@ class PQCSessionManager:
         """
         Valida se uma sessão PQC está ativa e pertence ao usuário.
         
-        Usado como dependency em rotas protegidas.
+        Usado como dependency em rotas protegidas. O dono vem do próprio
+        session_id (HMAC); depois basta uma consulta ao dict com a expiração.
         """
-        session = self.get_session(session_id)
-        if not session:
-            return False
-        
-        # Verifica se a sessão pertence ao usuário correto
-        if session.user_id != user_id:
+        if not _session_id_belongs_to(session_id, user_id):
             return False
-        
-        # Verifica expiração
-        now = datetime.now(timezone.utc)
-        if now > session.expires_at:
-            self._active_sessions.pop(session_id, None)
-            return False
-        
-        return True
+        return self.get_session(session_id) is not None
     
     def revoke_session(self, session_id: str) -> bool:
         """
         Revoga uma sessão PQC (logout PQC).
         """
-        return self._active_sessions.pop(session_id, None) is not None
+        with self._lock:
+            session = self._active_sessions.pop(session_id, None)
+            if session is None:
+                return False
+            self._forget_user_session(session)
+        wipe_bytes(session.shared_secret_hash)
+        return True
     
     def revoke_all_user_sessions(self, user_id: uuid.UUID) -> int:
         """
         Revoga todas as sessões PQC de um usuário.
-        """
-        sessions_to_remove = [
-            sid for sid, session in self._active_sessions.items()
-            if session.user_id == user_id
-        ]
         
-        for sid in sessions_to_remove:
-            self._active_sessions.pop(sid, None)
+        Visita só as sessões do próprio usuário (via _user_sessions).
+        """
+        with self._lock:
+            sessions = [
+                self._active_sessions.pop(sid, None)
+                for sid in self._user_sessions.pop(user_id, ())
+            ]
+        removed = 0
+        for session in sessions:
+            if session is not None:
+                wipe_bytes(session.shared_secret_hash)
+                removed += 1
+        return removed
+    
+    def _forget_user_session(self, session: PQCSession) -> None:
+        """
+        Tira a sessão do índice por usuário (e o usuário, se ficar sem sessões).
         
-        return len(sessions_to_remove)
+        Chamar com self._lock: sem ele, um complete_handshake concorrente
+        poderia adicionar a sessão a um set já retirado do dict.
+        """
+        session_ids = self._user_sessions.get(session.user_id)
+        if session_ids is not None:
+            session_ids.discard(session.session_id)
+            if not session_ids:
+                del self._user_sessions[session.user_id]
     
     def _cleanup_expired_handshakes(self) -> None:
-        """Remove handshakes expirados."""
-        now = datetime.now(timezone.utc)
-        expired = [
-            hid for hid, h in self._pending_handshakes.items()
-            if now > h.expires_at
-        ]
-        for hid in expired:
-            self._pending_handshakes.pop(hid, None)
+        """Remove handshakes expirados (e zera a chave privada de cada um)."""
+        with self._lock:
+            expired = self._pop_expired(self._handshake_expiry, self._pending_handshakes)
+        for handshake in expired:
+            wipe_bytes(handshake.secret_key)
     
     def _cleanup_expired_sessions(self) -> None:
-        """Remove sessões expiradas."""
-        now = datetime.now(timezone.utc)
-        expired = [
-            sid for sid, s in self._active_sessions.items()
-            if now > s.expires_at
-        ]
-        for sid in expired:
-            self._active_sessions.pop(sid, None)
+        """Remove sessões expiradas (e zera o hash de cada uma)."""
+        with self._lock:
+            expired = self._pop_expired(self._session_expiry, self._active_sessions)
+            for session in expired:
+                self._forget_user_session(session)
+        for session in expired:
+            wipe_bytes(session.shared_secret_hash)
+    
+    @staticmethod
+    def _pop_expired(
+        expiry: List[Tuple[float, str]],
+        entries: Dict[str, PendingHandshake] | Dict[str, PQCSession],
+    ) -> list:
+        """
+        Retira do heap só as entradas vencidas: O(log N) por item expirado.
+        
+        Entradas já consumidas ou revogadas continuam no heap até vencerem;
+        por isso confere se o id ainda existe e se está de fato expirado.
+        Devolve as entradas removidas.
+        """
+        now = time.monotonic()
+        removed = []
+        while expiry and now > expiry[0][0]:
+            _, entry_id = heapq.heappop(expiry)
+            entry = entries.get(entry_id)
+            if entry is not None and now > entry.expires_at_ts:
+                entries.pop(entry_id, None)
+                removed.append(entry)
+        return removed
+    
+    async def run_cleanup_loop(self, interval_seconds: float) -> None:
+        """
+        Remove handshakes e sessões expirados a cada `interval_seconds`.
+        
+        Roda como tarefa asyncio criada no lifespan da aplicação (app/main.py),
+        fora do caminho crítico das requisições. Uma falha é registrada no
+        log sem encerrar a tarefa.
+        """
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                self._cleanup_expired_handshakes()
+                self._cleanup_expired_sessions()
+            except Exception:
+                logger.exception("Falha na limpeza de sessões PQC expiradas")
     
     def get_stats(self) -> dict:
         """
         Retorna estatísticas sobre sessões (útil para monitoramento).
-        """
-        self._cleanup_expired_handshakes()
-        self._cleanup_expired_sessions()
         
+        Pode incluir expirados ainda não removidos pela limpeza periódica.
+        """
         return {
             "pending_handshakes": len(self._pending_handshakes),
             "active_sessions": len(self._active_sessions),
         }
 
 
-# Singleton global do gerenciador de sessões
-pqc_session_manager = PQCSessionManager()
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+def _remaining_ts(expires_at: datetime) -> float:
+    """Converte a expiração absoluta em time.monotonic() deste processo."""
+    remaining = (expires_at - datetime.now(timezone.utc)).total_seconds()
+    return time.monotonic() + remaining
+
+
+def _handshake_to_json(handshake: PendingHandshake) -> str:
+    return json.dumps({
+        "handshake_id": handshake.handshake_id,
+        "user_id": str(handshake.user_id),
+        "algorithm": handshake.algorithm,
+        "secret_key": _b64(handshake.secret_key),
+        "public_key": _b64(handshake.public_key),
+        "created_at": handshake.created_at.isoformat(),
+        "expires_at": handshake.expires_at.isoformat(),
+    })
+
+
+def _handshake_from_json(raw: bytes) -> PendingHandshake:
+    data = json.loads(raw)
+    expires_at = datetime.fromisoformat(data["expires_at"])
+    return PendingHandshake(
+        handshake_id=data["handshake_id"],
+        user_id=uuid.UUID(data["user_id"]),
+        algorithm=data["algorithm"],
+        secret_key=bytearray(base64.b64decode(data["secret_key"])),
+        public_key=base64.b64decode(data["public_key"]),
+        created_at=datetime.fromisoformat(data["created_at"]),
+        expires_at=expires_at,
+        expires_at_ts=_remaining_ts(expires_at),
+    )
+
+
+def _session_to_json(session: PQCSession) -> str:
+    return json.dumps({
+        "session_id": session.session_id,
+        "user_id": str(session.user_id),
+        "algorithm": session.algorithm,
+        "shared_secret_hash": _b64(session.shared_secret_hash),
+        "created_at": session.created_at.isoformat(),
+        "expires_at": session.expires_at.isoformat(),
+    })
+
+
+def _session_from_json(raw: bytes) -> PQCSession:
+    data = json.loads(raw)
+    expires_at = datetime.fromisoformat(data["expires_at"])
+    return PQCSession(
+        session_id=data["session_id"],
+        user_id=uuid.UUID(data["user_id"]),
+        algorithm=data["algorithm"],
+        shared_secret_hash=bytearray(base64.b64decode(data["shared_secret_hash"])),
+        created_at=datetime.fromisoformat(data["created_at"]),
+        expires_at=expires_at,
+        expires_at_ts=_remaining_ts(expires_at),
+    )
+
+
+class RedisPQCSessionManager:
+    """
+    Gerenciador de sessões PQC com Redis (mesma interface do PQCSessionManager).
+    
+    Ativado quando PQC_REDIS_URL está configurada. Permite várias instâncias
+    da API compartilharem handshakes e sessões, e a expiração fica com o TTL
+    do próprio Redis (SET ... EX): não há limpeza a fazer no Python.
+    
+    NOTA: a chave privada KEM do handshake pendente fica no Redis pelos
+    2 minutos do handshake; proteja o acesso ao servidor Redis.
+    """
+    
+    HANDSHAKE_PREFIX = "pqc:hs:"
+    SESSION_PREFIX = "pqc:sess:"
+    USER_PREFIX = "pqc:user:"  # SET com os session_ids de cada usuário
+    
+    def __init__(self, redis_url: str):
+        # Dependência opcional: só necessária quando PQC_REDIS_URL é usada
+        import redis
+        
+        self._redis = redis.Redis.from_url(redis_url)
+    
+    def create_pending_handshake(
+        self,
+        user_id: uuid.UUID,
+        algorithm: str,
+        secret_key: bytearray,
+        public_key: bytes,
+    ) -> PendingHandshake:
+        """Cria um handshake pendente com TTL de 2 minutos no Redis."""
+        handshake = _new_pending_handshake(user_id, algorithm, secret_key, public_key)
+        self._redis.set(
+            self.HANDSHAKE_PREFIX + handshake.handshake_id,
+            _handshake_to_json(handshake),
+            ex=int(HANDSHAKE_TTL.total_seconds()),
+        )
+        return handshake
+    
+    def get_pending_handshake(self, handshake_id: str) -> PendingHandshake | None:
+        """Recupera um handshake pendente (o Redis já descartou os expirados)."""
+        raw = self._redis.get(self.HANDSHAKE_PREFIX + handshake_id)
+        return _handshake_from_json(raw) if raw is not None else None
+    
+    def complete_handshake(
+        self,
+        handshake_id: str,
+        shared_secret: bytes,
+    ) -> PQCSession:
+        """
+        Completa o handshake e cria uma sessão PQC ativa.
+        
+        GETDEL lê e remove o handshake numa única operação atômica: duas
+        instâncias não conseguem completar o mesmo handshake.
+        """
+        raw = self._redis.getdel(self.HANDSHAKE_PREFIX + handshake_id)
+        if raw is None:
+            raise ValueError("Handshake not found or expired")
+        
+        handshake = _handshake_from_json(raw)
+        wipe_bytes(handshake.secret_key)
+        session = _new_session(handshake, shared_secret)
+        ttl = settings.PQC_SESSION_TTL_MINUTES * 60
+        user_key = self.USER_PREFIX + str(session.user_id)
+        
+        pipe = self._redis.pipeline()
+        pipe.set(self.SESSION_PREFIX + session.session_id, _session_to_json(session), ex=ttl)
+        pipe.sadd(user_key, session.session_id)
+        pipe.expire(user_key, ttl)
+        pipe.execute()
+        return session
+    
+    def get_session(self, session_id: str) -> PQCSession | None:
+        """Recupera uma sessão PQC ativa."""
+        raw = self._redis.get(self.SESSION_PREFIX + session_id)
+        return _session_from_json(raw) if raw is not None else None
+    
+    def validate_session(
+        self,
+        session_id: str,
+        user_id: uuid.UUID,
+    ) -> bool:
+        """
+        Valida se uma sessão PQC está ativa e pertence ao usuário.
+        
+        O dono vem do próprio session_id (HMAC) e a expiração é o TTL do
+        Redis: basta um EXISTS, sem desserializar a sessão.
+        """
+        if not _session_id_belongs_to(session_id, user_id):
+            return False
+        return self._redis.exists(self.SESSION_PREFIX + session_id) > 0
+    
+    def revoke_session(self, session_id: str) -> bool:
+        """Revoga uma sessão PQC (logout PQC) e a tira do SET do usuário."""
+        user_id = _session_user_id(session_id)
+        pipe = self._redis.pipeline()
+        pipe.delete(self.SESSION_PREFIX + session_id)
+        if user_id is not None:
+            pipe.srem(self.USER_PREFIX + str(user_id), session_id)
+        return pipe.execute()[0] > 0
+    
+    def revoke_all_user_sessions(self, user_id: uuid.UUID) -> int:
+        """Revoga todas as sessões PQC de um usuário."""
+        user_key = self.USER_PREFIX + str(user_id)
+        session_ids = self._redis.smembers(user_key)
+        self._redis.delete(user_key)
+        if not session_ids:
+            return 0
+        prefix = self.SESSION_PREFIX.encode()
+        return self._redis.delete(*(prefix + sid for sid in session_ids))
+    
+    async def run_cleanup_loop(self, interval_seconds: float) -> None:
+        """Nada a fazer: o Redis expira as chaves sozinho."""
+    
+    def get_stats(self) -> dict:
+        """
+        Retorna estatísticas sobre sessões (útil para monitoramento).
+        
+        Usa SCAN (sem bloquear o Redis): O(N) nas chaves, só para monitoramento.
+        """
+        scan = self._redis.scan_iter
+        return {
+            "pending_handshakes": sum(1 for _ in scan(match=self.HANDSHAKE_PREFIX + "*", count=1000)),
+            "active_sessions": sum(1 for _ in scan(match=self.SESSION_PREFIX + "*", count=1000)),
+        }
+
+
+def _build_session_manager() -> PQCSessionManager | RedisPQCSessionManager:
+    if settings.PQC_REDIS_URL:
+        return RedisPQCSessionManager(settings.PQC_REDIS_URL)
+    return PQCSessionManager()
+
+
+# Singleton global do gerenciador de sessões (Redis se PQC_REDIS_URL definida)
+pqc_session_manager = _build_session_manager()
@@ -1,10 +1,22 @@
+import asyncio
+import contextlib
+import logging
+from collections.abc import AsyncIterator
+from datetime import datetime, timezone
+
 import sentry_sdk
 from fastapi import FastAPI
 from fastapi.routing import APIRoute
 from starlette.middleware.cors import CORSMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.api.main import api_router
+from app.api.routes.pqc import service as pqc_service
 from app.core.config import settings
+from app.core.pqc_sessions import pqc_session_manager, request_now
+
+
+logger = logging.getLogger(__name__)
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -14,12 +26,66 @@ def custom_generate_unique_id(route: APIRoute) -> str:
 if settings.SENTRY_DSN and settings.ENVIRONMENT != "local":
     sentry_sdk.init(dsn=str(settings.SENTRY_DSN), enable_tracing=True)
 
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Limpeza periódica de handshakes/sessões PQC expirados
+    tasks = [
+        asyncio.create_task(
+            pqc_session_manager.run_cleanup_loop(settings.PQC_CLEANUP_INTERVAL_SECONDS)
+        )
+    ]
+    # Pré-geração de pares KEM (opcional) para o algoritmo padrão
+    if settings.PQC_PREKEY_POOL_SIZE > 0:
+        algorithm = settings.DEFAULT_PQC_KEM or pqc_service.recommended_algorithm()
+        if pqc_service.get_kem_details(algorithm) is None:
+            logger.error("PQC_PREKEY_POOL_SIZE ignorado: KEM %s não habilitado no liboqs", algorithm)
+        else:
+            tasks.append(
+                asyncio.create_task(
+                    pqc_service.run_prekey_refill(algorithm, settings.PQC_PREKEY_POOL_SIZE)
+                )
+            )
+    yield
+    for task in tasks:
+        task.cancel()
+    for task in tasks:
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
+    lifespan=lifespan,
 )
 
+
+class RequestNowMiddleware:
+    """
+    Um único datetime.now por request, lido pelo gerenciador de sessões PQC.
+    
+    Middleware ASGI puro: sem o custo do BaseHTTPMiddleware (@app.middleware),
+    que embrulha request/response de toda requisição.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = request_now.set(datetime.now(timezone.utc))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_now.reset(token)
+
+
+app.add_middleware(RequestNowMiddleware)
+
+
 # Set all CORS enabled origins
 if settings.all_cors_origins:
     app.add_middleware(
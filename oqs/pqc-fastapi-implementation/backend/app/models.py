@@ -169,3 +169,12 @@ class PQCKEMHandshakeResponse(SQLModel):
     client_shared_secret: str
     shared_secret_match: bool
     details: PQCKEMAlgorithm
+
+
+class PQCKEMHandshakeBatchRequest(SQLModel):
+    """Handshakes de demonstração para vários algoritmos, em paralelo (demo apenas)."""
+    algorithms: list[str] = Field(min_length=1, max_length=16)
+
+
+class PQCKEMHandshakeBatchResponse(SQLModel):
+    data: list[PQCKEMHandshakeResponse]
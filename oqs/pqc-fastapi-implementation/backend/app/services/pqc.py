@@ -1,23 +1,58 @@
 from __future__ import annotations
 
-import base64
+import asyncio
+from binascii import a2b_base64, b2a_base64
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
-import uuid
+from hmac import compare_digest
+import logging
+import os
+import queue
 
 import oqs
 
 
-def _b64encode(value: bytes) -> str:
-    """Keep JSON payloads binary-safe."""
-    return base64.b64encode(value).decode("ascii")
+logger = logging.getLogger(__name__)
 
 
-def _b64decode(value: str) -> bytes:
-    """Decode base64 string to bytes."""
-    return base64.b64decode(value.encode("ascii"))
+# Mecanismos habilitados no build do liboqs: fixos, lidos uma vez na importação
+_ENABLED_KEMS: tuple[str, ...] = tuple(oqs.get_enabled_kem_mechanisms())
 
+# Executor compartilhado pelos lotes de handshakes (uma thread por núcleo,
+# criadas sob demanda): sem subir e derrubar threads a cada requisição
+_BATCH_EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="pqc-batch")
 
-@dataclass(slots=True)
+
+try:
+    # pybase64 (SIMD: AVX2/NEON) é opcional; sem ele, usa o base64 da stdlib
+    import pybase64
+except ImportError:
+    pybase64 = None
+
+
+if pybase64 is not None:
+    def _b64encode(value: bytes) -> str:
+        """Keep JSON payloads binary-safe."""
+        return pybase64.b64encode_as_string(value)
+
+    def _b64decode(value: str) -> bytes:
+        """Decode base64 string to bytes."""
+        return pybase64.b64decode(value, validate=False)
+else:
+    # binascii direto: o que base64.b64encode/b64decode chamam por baixo
+    def _b64encode(value: bytes) -> str:
+        """Keep JSON payloads binary-safe."""
+        return b2a_base64(value, newline=False).decode("ascii")
+
+    def _b64decode(value: str) -> bytes:
+        """Decode base64 string to bytes."""
+        return a2b_base64(value)
+
+
+@dataclass(frozen=True, slots=True)
 class KEMDetails:
     name: str
     claimed_nist_level: int
@@ -44,7 +79,8 @@ class KEMKeyPair:
     """Par de chaves KEM gerado pelo servidor."""
     algorithm: str
     public_key: bytes
-    secret_key: bytes
+    secret_key: bytearray  # mutável: pode ser zerada depois do uso
+    public_key_b64: str | None = None  # codificada uma vez, pronta para o JSON
 
 
 class PQCService:
@@ -59,8 +95,60 @@ class PQCService:
     2. Cliente encapsula segredo usando chave pública (encapsulate_secret)
     3. Servidor decapsula usando chave privada (decapsulate_secret)
     4. Ambos compartilham o mesmo segredo sem transmiti-lo
+    
+    Contextos KeyEncapsulation só de encapsulamento (sem chave privada) são
+    reaproveitados por algoritmo (pool limitado a KEM_POOL_SIZE): evita o
+    init/free do liboqs a cada chamada. Contextos que recebem chave privada
+    (geração, decapsulamento) são sempre novos e liberados com free().
     """
 
+    KEM_POOL_SIZE = 32
+
+    # Padrões rápidos: chaves públicas de ~1 KB (Classic-McEliece passa de 250 KB)
+    FAST_DEFAULTS = ("ML-KEM-768", "Kyber768", "Kyber512")
+
+    def __init__(self) -> None:
+        self._kem_pool: dict[str, queue.LifoQueue[oqs.KeyEncapsulation]] = {}
+        # Pares pré-gerados por run_prekey_refill (vazio se desativado)
+        self._prekeys: dict[str, deque[KEMKeyPair]] = {}
+        # None se o build do liboqs não tiver nenhum KEM habilitado
+        self._recommended = next(
+            (name for name in self.FAST_DEFAULTS if name in _ENABLED_KEMS),
+            _ENABLED_KEMS[0] if _ENABLED_KEMS else None,
+        )
+
+    def recommended_algorithm(self) -> str:
+        """Primeiro de FAST_DEFAULTS habilitado no liboqs (senão, o primeiro KEM)."""
+        if self._recommended is None:
+            raise RuntimeError(
+                "liboqs has no KEM mechanism enabled; rebuild liboqs with at least one KEM"
+            )
+        return self._recommended
+
+    @contextmanager
+    def _borrow_kem(self, algorithm: str) -> Iterator[oqs.KeyEncapsulation]:
+        """
+        Empresta um contexto KEM do pool (ou cria um novo).
+        
+        Só para encap_secret: o contexto nunca guarda chave privada, então
+        volta ao pool sem nada a zerar. Se o pool estiver cheio, é liberado.
+        """
+        pool = self._kem_pool.get(algorithm)
+        try:
+            kem = pool.get_nowait() if pool is not None else oqs.KeyEncapsulation(algorithm)
+        except queue.Empty:
+            kem = oqs.KeyEncapsulation(algorithm)
+        try:
+            yield kem
+        finally:
+            if pool is None:
+                # Só cria o pool depois de um construtor bem-sucedido (nomes válidos)
+                pool = self._kem_pool.setdefault(algorithm, queue.LifoQueue(self.KEM_POOL_SIZE))
+            try:
+                pool.put_nowait(kem)
+            except queue.Full:
+                kem.free()
+
     def list_kem_algorithms(self) -> list[KEMDetails]:
         """
         Lista todos os algoritmos KEM disponíveis no liboqs.
@@ -70,10 +158,11 @@ class PQCService:
         - BIKE: Baseado em códigos, chaves menores
         - Classic-McEliece: Conservador, chaves muito grandes
         """
-        return [
-            self._build_kem_details(algorithm)
-            for algorithm in oqs.get_enabled_kem_mechanisms()
-        ]
+        return list(_DETAILS_TABLE.values())
+
+    def get_kem_details(self, algorithm: str) -> KEMDetails | None:
+        """Detalhes de um KEM habilitado (None se o liboqs não o oferece)."""
+        return _DETAILS_TABLE.get(algorithm)
 
     def generate_keypair(self, algorithm: str) -> KEMKeyPair:
         """
@@ -81,29 +170,67 @@ class PQCService:
         
         A chave pública será enviada ao cliente.
         A chave privada deve ser guardada temporariamente para decapsular.
+        Usa um par pré-gerado se houver (run_prekey_refill); cada par sai
+        do pool uma única vez.
         """
+        prekeys = self._prekeys.get(algorithm)
+        if prekeys:
+            try:
+                return prekeys.popleft()
+            except IndexError:
+                pass  # outra thread levou o último
+        return self._new_keypair(algorithm)
+
+    async def run_prekey_refill(
+        self, algorithm: str, size: int, interval_seconds: float = 0.5
+    ) -> None:
+        """
+        Mantém até `size` pares de `algorithm` prontos para generate_keypair.
+        
+        A geração roda em thread (asyncio.to_thread): o liboqs libera o GIL
+        e o event loop segue atendendo requisições. Uma falha é registrada
+        no log e a tarefa tenta de novo no próximo intervalo.
+        """
+        prekeys = self._prekeys.setdefault(algorithm, deque())
+        while True:
+            try:
+                while len(prekeys) < size:
+                    prekeys.append(await asyncio.to_thread(self._new_keypair, algorithm))
+            except Exception:
+                logger.exception("Falha ao pré-gerar pares KEM %s", algorithm)
+            await asyncio.sleep(interval_seconds)
+
+    def _new_keypair(self, algorithm: str) -> KEMKeyPair:
         with oqs.KeyEncapsulation(algorithm) as kem:
             public_key = kem.generate_keypair()
-            # IMPORTANTE: export_secret_key() extrai a chave privada
-            secret_key = kem.export_secret_key()
+            # IMPORTANTE: extrai a chave privada para um bytearray (zerável);
+            # a cópia bytes de export_secret_key() é descartada em seguida
+            secret_key = bytearray(kem.export_secret_key())
         
         return KEMKeyPair(
             algorithm=algorithm,
             public_key=public_key,
             secret_key=secret_key,
+            public_key_b64=_b64encode(public_key),
         )
     
-    def encapsulate_secret(self, algorithm: str, public_key_b64: str) -> tuple[bytes, bytes]:
+    def encapsulate_secret(
+        self, algorithm: str, public_key_b64: str | bytes
+    ) -> tuple[bytes, bytes]:
         """
         Cliente: Encapsula um segredo usando a chave pública do servidor.
         
+        Aceita a chave em base64 (str) ou já crua (bytes, sem decodificar).
+        
         Retorna:
         - ciphertext: enviado de volta ao servidor
         - shared_secret: usado localmente pelo cliente
         """
-        public_key = _b64decode(public_key_b64)
+        public_key = (
+            public_key_b64 if isinstance(public_key_b64, bytes) else _b64decode(public_key_b64)
+        )
         
-        with oqs.KeyEncapsulation(algorithm) as kem:
+        with self._borrow_kem(algorithm) as kem:
             ciphertext, shared_secret = kem.encap_secret(public_key)
         
         return ciphertext, shared_secret
@@ -111,7 +238,7 @@ class PQCService:
     def decapsulate_secret(
         self,
         algorithm: str,
-        secret_key: bytes,
+        secret_key: bytes | bytearray,
         ciphertext: bytes,
     ) -> bytes:
         """
@@ -120,8 +247,12 @@ class PQCService:
         O shared_secret resultante será idêntico ao do cliente,
         provando que ambos completaram o handshake KEM.
         """
-        # Restaura a chave privada no contexto KEM e decapsula
-        with oqs.KeyEncapsulation(algorithm, secret_key) as kem:
+        length = self._build_kem_details(algorithm).length_secret_key
+        if len(secret_key) != length:
+            raise ValueError(f"Secret key must be {length} bytes")
+        # Construtor público carrega a chave privada (exige bytes); o free() do
+        # `with` zera o buffer do liboqs ao sair
+        with oqs.KeyEncapsulation(algorithm, bytes(secret_key)) as kem:
             shared_secret = kem.decap_secret(ciphertext)
 
         return shared_secret
@@ -142,7 +273,7 @@ class PQCService:
         details = self._build_kem_details(algorithm)
         with oqs.KeyEncapsulation(algorithm) as server:
             public_key = server.generate_keypair()
-            with oqs.KeyEncapsulation(algorithm) as client:
+            with self._borrow_kem(algorithm) as client:
                 ciphertext, client_shared_secret = client.encap_secret(public_key)
             server_shared_secret = server.decap_secret(ciphertext)
 
@@ -152,19 +283,42 @@ class PQCService:
             ciphertext=_b64encode(ciphertext),
             server_shared_secret=_b64encode(server_shared_secret),
             client_shared_secret=_b64encode(client_shared_secret),
-            shared_secret_match=server_shared_secret == client_shared_secret,
+            shared_secret_match=compare_digest(server_shared_secret, client_shared_secret),
             details=details,
         )
 
+    def generate_kem_handshakes_batch(self, algorithms: list[str]) -> list[KEMHandshake]:
+        """
+        DEMONSTRAÇÃO: generate_kem_handshake para vários algoritmos em paralelo.
+        
+        O liboqs roda fora do GIL (chamadas ctypes), então as threads usam
+        núcleos diferentes. Resultados na ordem de `algorithms`; a primeira
+        falha é propagada. Usa o executor do módulo (_BATCH_EXECUTOR).
+        """
+        return list(_BATCH_EXECUTOR.map(self.generate_kem_handshake, algorithms))
+
     def _build_kem_details(self, algorithm: str) -> KEMDetails:
-        """Extrai detalhes de um algoritmo KEM."""
-        with oqs.KeyEncapsulation(algorithm) as kem:
-            return KEMDetails(
-                name=algorithm,
-                claimed_nist_level=kem.details['claimed_nist_level'],
-                is_classical_secured=kem.details.get('ind_cca2', False),
-                length_public_key=kem.details['length_public_key'],
-                length_secret_key=kem.details['length_secret_key'],
-                length_ciphertext=kem.details['length_ciphertext'],
-                length_shared_secret=kem.details['length_shared_secret'],
-            )
+        """Extrai detalhes de um algoritmo KEM (da tabela lida na importação)."""
+        details = _DETAILS_TABLE.get(algorithm)
+        # Fora da tabela: o construtor levanta MechanismNotSupportedError
+        return details if details is not None else _read_kem_details(algorithm)
+
+
+def _read_kem_details(algorithm: str) -> KEMDetails:
+    with oqs.KeyEncapsulation(algorithm) as kem:
+        return KEMDetails(
+            name=algorithm,
+            claimed_nist_level=kem.details['claimed_nist_level'],
+            is_classical_secured=kem.details.get('ind_cca2', False),
+            length_public_key=kem.details['length_public_key'],
+            length_secret_key=kem.details['length_secret_key'],
+            length_ciphertext=kem.details['length_ciphertext'],
+            length_shared_secret=kem.details['length_shared_secret'],
+        )
+
+
+# Detalhes são constantes do build do liboqs: uma única varredura na importação,
+# nenhum contexto KEM aberto por consulta depois disso
+_DETAILS_TABLE: dict[str, KEMDetails] = {
+    algorithm: _read_kem_details(algorithm) for algorithm in _ENABLED_KEMS
+}
@@ -0,0 +1,52 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.routes.pqc import service
+from app.core.config import settings
+
+ALGORITHM = service.recommended_algorithm()
+
+
+def test_kem_handshake_batch(client: TestClient) -> None:
+    algorithms = [ALGORITHM] * 16
+    response = client.post(
+        f"{settings.API_V1_STR}/pqc/kem/handshake/batch",
+        json={"algorithms": algorithms},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert [item["algorithm"] for item in content["data"]] == algorithms
+    assert all(item["shared_secret_match"] for item in content["data"])
+
+
+def test_kem_handshake_batch_too_many(client: TestClient) -> None:
+    response = client.post(
+        f"{settings.API_V1_STR}/pqc/kem/handshake/batch",
+        json={"algorithms": [ALGORITHM] * 17},
+    )
+    assert response.status_code == 422
+
+
+def test_kem_handshake_batch_empty(client: TestClient) -> None:
+    response = client.post(
+        f"{settings.API_V1_STR}/pqc/kem/handshake/batch",
+        json={"algorithms": []},
+    )
+    assert response.status_code == 422
+
+
+def test_kem_handshake_batch_rejects_large_kem(client: TestClient) -> None:
+    oversized = [
+        details.name
+        for details in service.list_kem_algorithms()
+        if settings.PQC_MAX_PUBLIC_KEY_BYTES is not None
+        and details.length_public_key > settings.PQC_MAX_PUBLIC_KEY_BYTES
+    ]
+    if not oversized:
+        pytest.skip("no enabled KEM above PQC_MAX_PUBLIC_KEY_BYTES")
+    response = client.post(
+        f"{settings.API_V1_STR}/pqc/kem/handshake/batch",
+        json={"algorithms": [ALGORITHM, oversized[0]]},
+    )
+    assert response.status_code == 400
+    assert oversized[0] in response.json()["detail"]
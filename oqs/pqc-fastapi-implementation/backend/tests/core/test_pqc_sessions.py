@@ -0,0 +1,195 @@
+import asyncio
+import uuid
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import fakeredis
+import pytest
+
+from app.core.pqc_sessions import PQCSessionManager, RedisPQCSessionManager
+from app.services.pqc import PQCService
+
+
+@pytest.fixture()
+def redis_manager() -> Generator[RedisPQCSessionManager, None, None]:
+    server = fakeredis.FakeServer()
+    with patch("redis.Redis.from_url", return_value=fakeredis.FakeRedis(server=server)):
+        yield RedisPQCSessionManager("redis://fake")
+
+
+def _new_session(manager: RedisPQCSessionManager, user_id: uuid.UUID) -> str:
+    handshake = manager.create_pending_handshake(
+        user_id, "ML-KEM-768", bytearray(b"secret"), b"public"
+    )
+    return manager.complete_handshake(handshake.handshake_id, b"shared").session_id
+
+
+def test_create_and_get_pending_handshake(redis_manager: RedisPQCSessionManager) -> None:
+    user_id = uuid.uuid4()
+    handshake = redis_manager.create_pending_handshake(
+        user_id, "ML-KEM-768", bytearray(b"secret"), b"public"
+    )
+    stored = redis_manager.get_pending_handshake(handshake.handshake_id)
+    assert stored is not None
+    assert stored.user_id == user_id
+    assert stored.secret_key == bytearray(b"secret")
+    assert stored.public_key == b"public"
+    assert redis_manager.get_pending_handshake("missing") is None
+
+
+def test_complete_handshake_consumes_it(redis_manager: RedisPQCSessionManager) -> None:
+    user_id = uuid.uuid4()
+    handshake = redis_manager.create_pending_handshake(
+        user_id, "ML-KEM-768", bytearray(b"secret"), b"public"
+    )
+    session = redis_manager.complete_handshake(handshake.handshake_id, b"shared")
+    assert session.user_id == user_id
+    assert redis_manager.get_pending_handshake(handshake.handshake_id) is None
+    with pytest.raises(ValueError):
+        redis_manager.complete_handshake(handshake.handshake_id, b"shared")
+
+
+def test_validate_session(redis_manager: RedisPQCSessionManager) -> None:
+    user_id = uuid.uuid4()
+    session_id = _new_session(redis_manager, user_id)
+    assert redis_manager.validate_session(session_id, user_id)
+    assert not redis_manager.validate_session(session_id, uuid.uuid4())
+    tampered = session_id[:-1] + ("A" if session_id[-1] != "A" else "B")
+    assert not redis_manager.validate_session(tampered, user_id)
+
+
+def test_revoke_session(redis_manager: RedisPQCSessionManager) -> None:
+    user_id = uuid.uuid4()
+    session_id = _new_session(redis_manager, user_id)
+    assert redis_manager.revoke_session(session_id)
+    assert not redis_manager.validate_session(session_id, user_id)
+    assert not redis_manager.revoke_session(session_id)
+
+
+def test_revoke_all_user_sessions(redis_manager: RedisPQCSessionManager) -> None:
+    user_id = uuid.uuid4()
+    other_user_id = uuid.uuid4()
+    session_ids = [_new_session(redis_manager, user_id) for _ in range(3)]
+    other_session_id = _new_session(redis_manager, other_user_id)
+    assert redis_manager.revoke_all_user_sessions(user_id) == 3
+    assert not any(redis_manager.validate_session(sid, user_id) for sid in session_ids)
+    assert redis_manager.validate_session(other_session_id, other_user_id)
+    assert redis_manager.revoke_all_user_sessions(user_id) == 0
+
+
+def test_get_stats(redis_manager: RedisPQCSessionManager) -> None:
+    user_id = uuid.uuid4()
+    redis_manager.create_pending_handshake(
+        user_id, "ML-KEM-768", bytearray(b"secret"), b"public"
+    )
+    _new_session(redis_manager, user_id)
+    _new_session(redis_manager, user_id)
+    assert redis_manager.get_stats() == {
+        "pending_handshakes": 1,
+        "active_sessions": 2,
+    }
+
+
+def test_secrets_are_zeroed_after_complete_and_revoke() -> None:
+    service = PQCService()
+    manager = PQCSessionManager()
+    algorithm = service.recommended_algorithm()
+    keypair = service.generate_keypair(algorithm)
+    handshake = manager.create_pending_handshake(
+        uuid.uuid4(), algorithm, keypair.secret_key, keypair.public_key
+    )
+    ciphertext, _ = service.encapsulate_secret(algorithm, keypair.public_key)
+    shared_secret = service.decapsulate_secret(algorithm, keypair.secret_key, ciphertext)
+    session = manager.complete_handshake(handshake.handshake_id, shared_secret)
+    assert keypair.secret_key == bytearray(len(keypair.secret_key))
+    assert any(session.shared_secret_hash)
+    assert manager.revoke_session(session.session_id)
+    assert session.shared_secret_hash == bytearray(32)
+
+
+def test_revoke_session_updates_user_index(redis_manager: RedisPQCSessionManager) -> None:
+    user_id = uuid.uuid4()
+    session_id = _new_session(redis_manager, user_id)
+    kept_session_id = _new_session(redis_manager, user_id)
+    assert redis_manager.revoke_session(session_id)
+    user_key = redis_manager.USER_PREFIX + str(user_id)
+    assert redis_manager._redis.smembers(user_key) == {kept_session_id.encode()}
+
+
+def test_empty_user_index_is_dropped() -> None:
+    manager = PQCSessionManager()
+    user_id = uuid.uuid4()
+    handshake = manager.create_pending_handshake(
+        user_id, "ML-KEM-768", bytearray(b"secret"), b"public"
+    )
+    session = manager.complete_handshake(handshake.handshake_id, b"shared")
+    assert manager.revoke_session(session.session_id)
+    assert user_id not in manager._user_sessions
+
+
+def test_user_index_under_concurrency() -> None:
+    manager = PQCSessionManager()
+    user_id = uuid.uuid4()
+
+    def complete() -> str:
+        handshake = manager.create_pending_handshake(
+            user_id, "ML-KEM-768", bytearray(b"secret"), b"public"
+        )
+        return manager.complete_handshake(handshake.handshake_id, b"shared").session_id
+
+    def complete_and_revoke() -> None:
+        manager.revoke_session(complete())
+
+    def complete_and_keep() -> None:
+        complete()
+
+    def revoke_all() -> None:
+        manager.revoke_all_user_sessions(user_id)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for _ in range(200):
+            executor.submit(complete_and_revoke)
+            executor.submit(complete_and_keep)
+            executor.submit(revoke_all)
+
+    # Toda sessão viva do usuário está no índice: revoke_all leva todas
+    manager.revoke_all_user_sessions(user_id)
+    assert not any(
+        session.user_id == user_id for session in manager._active_sessions.values()
+    )
+    assert user_id not in manager._user_sessions
+
+
+def test_cleanup_loop_survives_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    manager = PQCSessionManager()
+    calls = 0
+
+    def flaky_cleanup() -> None:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("cleanup failure")
+
+    monkeypatch.setattr(manager, "_cleanup_expired_handshakes", flaky_cleanup)
+
+    async def run() -> None:
+        task = asyncio.create_task(manager.run_cleanup_loop(0.01))
+        await asyncio.sleep(0.1)
+        assert not task.done()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert calls > 1
+
+
+def test_handshake_and_session_are_hashable() -> None:
+    manager = PQCSessionManager()
+    handshake = manager.create_pending_handshake(
+        uuid.uuid4(), "ML-KEM-768", bytearray(b"secret"), b"public"
+    )
+    assert handshake in {handshake}
+    session = manager.complete_handshake(handshake.handshake_id, b"shared")
+    assert session in {session}
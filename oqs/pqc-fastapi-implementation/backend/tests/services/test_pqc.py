@@ -0,0 +1,103 @@
+import asyncio
+from contextlib import ExitStack
+
+import pytest
+
+from app.services.pqc import KEMKeyPair, PQCService
+
+ALGORITHM = PQCService().recommended_algorithm()
+
+
+def test_decapsulate_secret_matches_client() -> None:
+    service = PQCService()
+    keypair = service.generate_keypair(ALGORITHM)
+    ciphertext, client_secret = service.encapsulate_secret(ALGORITHM, keypair.public_key)
+    assert service.decapsulate_secret(ALGORITHM, keypair.secret_key, ciphertext) == client_secret
+    assert (
+        service.decapsulate_secret(ALGORITHM, bytes(keypair.secret_key), ciphertext)
+        == client_secret
+    )
+
+
+def test_decapsulate_secret_rejects_wrong_key_length() -> None:
+    service = PQCService()
+    keypair = service.generate_keypair(ALGORITHM)
+    ciphertext, _ = service.encapsulate_secret(ALGORITHM, keypair.public_key)
+    with pytest.raises(ValueError):
+        service.decapsulate_secret(ALGORITHM, keypair.secret_key[:-1], ciphertext)
+
+
+def test_encapsulation_contexts_are_reused() -> None:
+    service = PQCService()
+    keypair = service.generate_keypair(ALGORITHM)
+    service.encapsulate_secret(ALGORITHM, keypair.public_key)
+    with service._borrow_kem(ALGORITHM) as first:
+        pass
+    with service._borrow_kem(ALGORITHM) as second:
+        pass
+    assert first is second
+    assert service._kem_pool[ALGORITHM].qsize() == 1
+
+
+def test_pool_is_bounded() -> None:
+    service = PQCService()
+    with ExitStack() as stack:
+        for _ in range(service.KEM_POOL_SIZE + 4):
+            stack.enter_context(service._borrow_kem(ALGORITHM))
+    assert service._kem_pool[ALGORITHM].qsize() == service.KEM_POOL_SIZE
+
+
+def test_secret_key_contexts_are_not_pooled() -> None:
+    service = PQCService()
+    keypair = service.generate_keypair(ALGORITHM)
+    assert ALGORITHM not in service._kem_pool
+    ciphertext, _ = service.encapsulate_secret(ALGORITHM, keypair.public_key)
+    service.decapsulate_secret(ALGORITHM, keypair.secret_key, ciphertext)
+    service.generate_kem_handshake(ALGORITHM)
+    # Só os contextos de encapsulamento voltaram ao pool
+    assert service._kem_pool[ALGORITHM].qsize() == 1
+
+
+def test_recommended_algorithm_without_enabled_kems(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr("app.services.pqc._ENABLED_KEMS", ())
+    service = PQCService()
+    with pytest.raises(RuntimeError):
+        service.recommended_algorithm()
+
+
+def test_get_kem_details() -> None:
+    service = PQCService()
+    details = service.get_kem_details(ALGORITHM)
+    assert details is not None
+    assert details.name == ALGORITHM
+    assert service.get_kem_details("not-a-kem") is None
+
+
+def test_prekey_refill_survives_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    service = PQCService()
+    real_new_keypair = service._new_keypair
+    calls = 0
+
+    def flaky_new_keypair(algorithm: str) -> KEMKeyPair:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("liboqs failure")
+        return real_new_keypair(algorithm)
+
+    monkeypatch.setattr(service, "_new_keypair", flaky_new_keypair)
+
+    async def run() -> None:
+        task = asyncio.create_task(service.run_prekey_refill(ALGORITHM, 2, 0.01))
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if len(service._prekeys[ALGORITHM]) == 2:
+                break
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert len(service._prekeys[ALGORITHM]) == 2
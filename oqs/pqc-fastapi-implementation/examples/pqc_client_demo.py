@@ -12,7 +12,7 @@ Uso:
 """
 
 import base64
-import requests
+import httpx
 
 try:
     import oqs
@@ -26,13 +26,17 @@ BASE_URL = "http://localhost:8000/api/v1"
 EMAIL = "admin@example.com"
 PASSWORD = "password"
 
+# Um único cliente: reaproveita a conexão (keep-alive) entre as chamadas, para
+# que o tempo medido seja o do PQC e não o de abrir TCP a cada requisição
+CLIENT = httpx.Client(base_url=BASE_URL)
+
 
 def login() -> str:
     """Etapa 1: Login tradicional JWT."""
     print("\n📧 1. Login JWT...")
     
-    response = requests.post(
-        f"{BASE_URL}/login/access-token",
+    response = CLIENT.post(
+        "/login/access-token",
         data={
             "username": EMAIL,
             "password": PASSWORD,
@@ -53,7 +57,7 @@ def list_algorithms() -> None:
     """Lista algoritmos KEM disponíveis."""
     print("\n🔐 2. Listar algoritmos PQC...")
     
-    response = requests.get(f"{BASE_URL}/pqc/kems")
+    response = CLIENT.get("/pqc/kems")
     kems = response.json()["data"]
     
     print(f"✅ {len(kems)} algoritmos disponíveis:")
@@ -69,8 +73,8 @@ def pqc_handshake(jwt_token: str, algorithm: str = "Kyber512") -> str:
     
     # Etapa 3.1: Iniciar handshake (servidor gera chaves)
     print("   → POST /pqc/handshake/init")
-    response = requests.post(
-        f"{BASE_URL}/pqc/handshake/init",
+    response = CLIENT.post(
+        "/pqc/handshake/init",
         headers=headers,
         json={"algorithm": algorithm},
     )
@@ -100,8 +104,8 @@ def pqc_handshake(jwt_token: str, algorithm: str = "Kyber512") -> str:
     
     # Etapa 3.3: Completar handshake (servidor decapsula)
     print("   → POST /pqc/handshake/complete")
-    response = requests.post(
-        f"{BASE_URL}/pqc/handshake/complete",
+    response = CLIENT.post(
+        "/pqc/handshake/complete",
         headers=headers,
         json={
             "handshake_id": handshake_id,
@@ -140,8 +144,8 @@ def update_password_with_pqc(jwt_token: str, pqc_session: str) -> None:
     print(f"   → Headers: JWT + X-PQC-Session")
     
     # Descomente para realmente trocar senha:
-    # response = requests.patch(
-    #     f"{BASE_URL}/users/me/password",
+    # response = CLIENT.patch(
+    #     "/users/me/password",
     #     headers=headers,
     #     json={
     #         "current_password": PASSWORD,
@@ -159,8 +163,8 @@ def test_without_pqc(jwt_token: str) -> None:
     
     headers = {"Authorization": f"Bearer {jwt_token}"}
     
-    response = requests.patch(
-        f"{BASE_URL}/users/me/password",
+    response = CLIENT.patch(
+        "/users/me/password",
         headers=headers,
         json={
             "current_password": PASSWORD,
@@ -180,7 +184,7 @@ def get_stats(jwt_token: str) -> None:
     print("\n📊 6. Estatísticas das sessões...")
     
     headers = {"Authorization": f"Bearer {jwt_token}"}
-    response = requests.get(f"{BASE_URL}/pqc/sessions/stats", headers=headers)
+    response = CLIENT.get("/pqc/sessions/stats", headers=headers)
     
     if response.status_code == 200:
         stats = response.json()
@@ -222,7 +226,7 @@ def main():
         print("  ✓ Operações críticas exigem ambos (JWT + PQC)")
         print("  ✓ Sistema protegido contra ataques quânticos futuros")
         
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         print("\n❌ Erro: Não foi possível conectar ao servidor!")
         print("   Certifique-se de que a API está rodando:")
         print("   cd backend && uvicorn app.main:app --reload")
@@ -230,6 +234,8 @@ def main():
         print(f"\n❌ Erro inesperado: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        CLIENT.close()
 
 
 if __name__ == "__main__":